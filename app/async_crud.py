@@ -0,0 +1,397 @@
+"""
+커뮤니티(마이페이지/게시글/댓글/좋아요)와 신고 목록 조회 (AsyncMongoClient)
+- 응답 형식/검증/업데이트 스펙 헬퍼는 crud.py 것을 사용하고, 여기서는 쿼리 실행만 담당
+- 회원가입/로그인/비밀번호 변경도 여기서 (bcrypt 는 passwords.py 풀에서 await)
+- 신고 등록/탐지 등은 crud.py (sync)
+"""
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.async_database import (
+    comments_collection, damage_report_list_collection, post_collection,
+    post_likes_collection, post_list_collection, users_collection,
+)
+from app.auth import invalidate_principal
+from app.models import UserLogin, UserRegister
+from app.passwords import hash_password, needs_rehash, verify_password
+from app.crud import (
+    COMMENT_LIST_PROJECTION, COMMENT_PREVIEW_LENGTH, COMMENT_PREVIEW_SIZE,
+    LIKE_LIST_PROJECTION, POST_LIST_PROJECTION, REPORT_LIST_PROJECTION,
+    _bbox_filter, _check_local_id, _check_post_owner, _circle_filter, _comment_added_update,
+    _comment_oid, _comment_post_oid, _comment_removed_pipeline, _format_comment_page,
+    _format_like_list, _format_like_statuses, _format_mypage, _format_post_detail,
+    _format_post_list, _format_user_report, _geo_report_query, _like_result, _like_status_batch,
+    _mypage_update_fields, _new_comment, _new_like, _new_post, _post_oid, _post_update_fields,
+    _preview_was_removed, _report_summary, _user_oids, comment_preview,
+)
+from app.pagination import DEFAULT_PAGE_SIZE, apaginate
+
+POST_NOT_FOUND = "⚠️ 게시글을 찾을 수 없습니다."
+# 지역별 게시글 수는 페이지마다 세지 않고 이 시간 동안 재사용 (total 은 근사치)
+LOCAL_POST_COUNT_TTL_SECONDS = float(os.getenv("LOCAL_POST_COUNT_TTL_SECONDS", "60"))
+
+_local_post_counts = {}  # local_id → (만료 시각, 개수), 키는 LOCAL_CODES 범위로 제한됨
+
+
+# 회원가입
+async def create_user(user: UserRegister):
+    if await users_collection.find_one({"email": user.email}):
+        raise ValueError("⚠️ 이미 등록된 이메일입니다.")
+
+    user_dict = user.dict()
+    user_dict["password"] = await hash_password(user.password)
+    user_dict["create_date"] = datetime.utcnow()
+
+    await users_collection.insert_one(user_dict)
+
+
+# 로그인
+async def authenticate_user(login_data: UserLogin):
+    user = await users_collection.find_one({"email": login_data.email})
+    if not user:
+        return None  # 존재하지 않는 사용자
+
+    if not await verify_password(login_data.password, user["password"]):
+        return None  # 비밀번호 틀림
+
+    # BCRYPT_ROUNDS 가 바뀌었으면 새 비용으로 다시 저장 (실패해도 로그인은 성공)
+    if needs_rehash(user["password"]):
+        try:
+            await users_collection.update_one(
+                {"_id": user["_id"], "password": user["password"]},
+                {"$set": {"password": await hash_password(login_data.password)}}
+            )
+        except HTTPException:
+            pass
+
+    return user  # 인증 성공 시 사용자 정보 반환
+
+
+# 비밀번호 변경
+async def change_user_password(user_id: str, current_pw: str, new_pw: str):
+    user = await users_collection.find_one({"_id": ObjectId(user_id)})
+
+    if not user or not await verify_password(current_pw, user["password"]):
+        raise HTTPException(status_code=400, detail="⚠️ 현재 비밀번호가 올바르지 않습니다.")
+
+    new_hashed = await hash_password(new_pw)
+    await users_collection.update_one({"_id": ObjectId(user_id)}, {"$set": {"password": new_hashed}})
+    invalidate_principal(user_id)
+
+
+# 마이페이지
+async def get_user_mypage(user_id: str):
+    user = await users_collection.find_one({"_id": ObjectId(user_id)}, {"password": 0})
+    if not user:
+        raise HTTPException(status_code=404, detail="❌ 사용자 정보를 찾을 수 없습니다.")
+    return _format_mypage(user)
+
+async def update_user_mypage(user_id: str, update_data: dict):
+    await users_collection.update_one(
+        {"_id": ObjectId(user_id)},
+        {"$set": _mypage_update_fields(update_data)}
+    )
+    invalidate_principal(user_id)
+
+
+# 게시글
+async def create_post(user: dict, post_data: dict):
+    post = _new_post(user, post_data)
+    await post_collection.insert_one(post)
+    return post
+
+async def _liked_post_ids(post_ids: List[str], user_id: str) -> set:
+    """post_ids 중 user_id 가 좋아요 누른 글 (post_likes 에 $in 1회)"""
+    if not post_ids:
+        return set()
+    rows = post_likes_collection.find(
+        {"post_id": {"$in": post_ids}, "user_id": user_id},
+        {"post_id": 1, "_id": 0}
+    )
+    return {row["post_id"] async for row in rows}
+
+async def get_all_posts_with_index(cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                                   user_id: Optional[str] = None):
+    posts, next_cursor = await apaginate(
+        post_list_collection, {}, cursor, limit, projection=POST_LIST_PROJECTION
+    )
+
+    formatted = _format_post_list(posts)
+    if user_id:
+        # 로그인한 경우 목록에 내 좋아요 여부 포함
+        liked = await _liked_post_ids([p["id"] for p in formatted], user_id)
+        for post in formatted:
+            post["liked_by_me"] = post["id"] in liked
+
+    return {
+        "posts": formatted,
+        "next_cursor": next_cursor,
+        "total": await post_list_collection.estimated_document_count()  # 메타데이터 기반 근사치
+    }
+
+async def _local_post_count(local_id: int) -> int:
+    now = time.monotonic()
+    cached = _local_post_counts.get(local_id)
+    if cached and cached[0] > now:
+        return cached[1]
+    count = await post_list_collection.count_documents({"local_id": local_id})  # (local_id, ...) 인덱스
+    _local_post_counts[local_id] = (now + LOCAL_POST_COUNT_TTL_SECONDS, count)
+    return count
+
+async def get_posts_by_local(local_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+    _check_local_id(local_id)
+
+    posts, next_cursor = await apaginate(
+        post_list_collection, {"local_id": local_id}, cursor, limit, projection=POST_LIST_PROJECTION
+    )
+
+    return {
+        "posts": _format_post_list(posts),
+        "next_cursor": next_cursor,
+        "total": await _local_post_count(local_id)
+    }
+
+async def get_post_detail(post_id: str):
+    post = await post_collection.find_one({"_id": _post_oid(post_id)})
+    if not post:
+        raise HTTPException(status_code=404, detail=POST_NOT_FOUND)
+    return _format_post_detail(post)
+
+async def update_post(post_id: str, user_id: str, update_data: dict):
+    oid = _post_oid(post_id)
+    _check_post_owner(await post_collection.find_one({"_id": oid}, {"user_id": 1}), user_id, "수정")
+    await post_collection.update_one({"_id": oid}, {"$set": _post_update_fields(update_data)})
+
+async def delete_post(post_id: str, user_id: str):
+    oid = _post_oid(post_id)
+    _check_post_owner(await post_collection.find_one({"_id": oid}, {"user_id": 1}), user_id, "삭제")
+    await post_collection.delete_one({"_id": oid})
+
+
+# 댓글
+async def _refill_comment_previews(post_oid: ObjectId, post_id: str):
+    """미리보기에서 빠진 자리를 최신 댓글로 다시 채움 (post_id_created_at_id 인덱스)"""
+    latest = await comments_collection.find({"post_id": post_id}).sort(
+        [("created_at", -1), ("_id", -1)]
+    ).limit(COMMENT_PREVIEW_SIZE).to_list()
+    await post_collection.update_one(
+        {"_id": post_oid},
+        {"$set": {"recent_comments": [comment_preview(c) for c in latest]}}
+    )
+
+async def add_comment(user: dict, comment_data: dict):
+    post_oid = _post_oid(comment_data["post_id"])
+    comment = _new_comment(user, comment_data)
+    await comments_collection.insert_one(comment)
+
+    result = await post_collection.update_one({"_id": post_oid}, _comment_added_update(comment))
+    if result.matched_count == 0:
+        await comments_collection.delete_one({"_id": comment["_id"]})
+        raise HTTPException(status_code=404, detail=POST_NOT_FOUND)
+    return comment
+
+async def update_comment(comments_id: str, users_id: str, new_content: str):
+    comment = await comments_collection.find_one_and_update(
+        {"_id": _comment_oid(comments_id, users_id), "user_id": users_id},
+        {"$set": {"content": new_content}},
+        projection={"post_id": 1}
+    )
+    if comment is None:
+        raise HTTPException(status_code=404, detail="댓글을 찾을 수 없거나 수정 권한이 없습니다.")
+
+    # 미리보기에 들어 있는 댓글이면 내용도 맞춰줌
+    post_oid = _comment_post_oid(comment)
+    if post_oid is None:
+        return
+    await post_collection.update_one(
+        {"_id": post_oid, "recent_comments.id": comments_id},
+        {"$set": {"recent_comments.$.content": new_content[:COMMENT_PREVIEW_LENGTH]}}
+    )
+
+async def delete_comment(comments_id: str, users_id: str):
+    comment = await comments_collection.find_one_and_delete(
+        {"_id": _comment_oid(comments_id, users_id), "user_id": users_id},
+        projection={"post_id": 1}
+    )
+    if comment is None:
+        raise HTTPException(status_code=404, detail="댓글을 찾을 수 없거나 삭제 권한이 없습니다.")
+
+    post_oid = _comment_post_oid(comment)
+    if post_oid is None:
+        return
+    before = await post_collection.find_one_and_update(
+        {"_id": post_oid},
+        _comment_removed_pipeline(comments_id),
+        projection={"recent_comments.id": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if _preview_was_removed(before, comments_id):
+        await _refill_comment_previews(post_oid, comment["post_id"])
+
+async def get_comments_by_post(post_id: str, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    특정 게시글의 댓글 목록 조회 (최신순, (created_at, _id) 커서 페이지네이션)
+    - total 은 게시글에 캐시된 comment_count (댓글 전체 count_documents 없음)
+    - 게시글 조회와 댓글 페이지 조회를 동시에 보내서 왕복 1회 시간으로 처리
+    """
+    post_oid = _post_oid(post_id)
+    post, (comments, next_cursor) = await asyncio.gather(
+        post_collection.find_one({"_id": post_oid}, {"comment_count": 1}),
+        apaginate(comments_collection, {"post_id": post_id}, cursor, limit,
+                  projection=COMMENT_LIST_PROJECTION),
+    )
+    if not post:
+        raise HTTPException(status_code=404, detail=POST_NOT_FOUND)
+    return _format_comment_page(post_id, comments, next_cursor, post.get("comment_count", 0))
+
+
+# 좋아요
+async def _insert_like(post_id: str, user_id: str) -> bool:
+    """(post_id, user_id) 유니크 인덱스로 insert - 이미 있으면 False"""
+    try:
+        await post_likes_collection.insert_one(_new_like(post_id, user_id))
+        return True
+    except DuplicateKeyError:
+        return False
+
+async def _increment_likes(oid: ObjectId, post_id: str, user_id: str) -> dict:
+    post = await post_collection.find_one_and_update(
+        {"_id": oid}, {"$inc": {"likes": 1}},
+        projection={"likes": 1}, return_document=ReturnDocument.AFTER
+    )
+    if post is None:
+        # 없는 게시글이면 방금 넣은 좋아요 되돌림
+        await post_likes_collection.delete_one({"post_id": post_id, "user_id": user_id})
+        raise HTTPException(status_code=404, detail=POST_NOT_FOUND)
+    return _like_result(post_id, True, True, post)
+
+async def add_like(post_id: str, user_id: str) -> dict:
+    """좋아요 (멱등) - 실제로 추가된 경우에만 likes +1 (왕복 2회)"""
+    oid = _post_oid(post_id)
+    if not await _insert_like(post_id, user_id):
+        return _like_result(post_id, True, False, await post_collection.find_one({"_id": oid}, {"likes": 1}))
+    return await _increment_likes(oid, post_id, user_id)
+
+async def remove_like(post_id: str, user_id: str) -> dict:
+    """좋아요 취소 (멱등) - 실제로 지워진 경우에만 likes -1, 0 아래로는 내려가지 않음"""
+    oid = _post_oid(post_id)
+    result = await post_likes_collection.delete_one({"post_id": post_id, "user_id": user_id})
+    if not result.deleted_count:
+        post = await post_collection.find_one({"_id": oid}, {"likes": 1})
+        if post is None:
+            raise HTTPException(status_code=404, detail=POST_NOT_FOUND)
+        return _like_result(post_id, False, False, post)
+
+    post = await post_collection.find_one_and_update(
+        {"_id": oid, "likes": {"$gt": 0}}, {"$inc": {"likes": -1}},
+        projection={"likes": 1}, return_document=ReturnDocument.AFTER
+    )
+    if post is None:
+        post = await post_collection.find_one({"_id": oid}, {"likes": 1})
+    return _like_result(post_id, False, True, post)
+
+async def toggle_like_post(post_id: str, user_id: str):
+    # 먼저 추가를 시도하고, 이미 있으면(유니크 인덱스 충돌) 취소로 처리
+    oid = _post_oid(post_id)
+    if not await _insert_like(post_id, user_id):
+        return await remove_like(post_id, user_id)
+    return await _increment_likes(oid, post_id, user_id)
+
+async def get_like_total(post_id: str) -> dict:
+    """좋아요 수만 조회 (로그인 불필요)"""
+    post = await post_collection.find_one({"_id": _post_oid(post_id)}, {"likes": 1})
+    if not post:
+        raise HTTPException(status_code=404, detail=POST_NOT_FOUND)
+    return {"post_id": post_id, "total_likes": post.get("likes", 0), "user_liked": None}
+
+async def get_like_status(post_id: str, user_id: str):
+    """특정 사용자의 게시글 좋아요 상태 조회"""
+    post = await post_collection.find_one({"_id": _post_oid(post_id)}, {"likes": 1})
+    if not post:
+        raise HTTPException(status_code=404, detail=POST_NOT_FOUND)
+    like_record = await post_likes_collection.find_one(
+        {"post_id": post_id, "user_id": user_id}, {"_id": 1}
+    )
+    return {
+        "post_id": post_id,
+        "user_liked": like_record is not None,
+        "total_likes": post.get("likes", 0)
+    }
+
+async def get_like_statuses(post_ids: List[str], user_id: str) -> dict:
+    """
+    여러 게시글의 좋아요 상태를 한 번에 조회
+    - post 에 $in 1회 (likes 총합), post_likes 에 $in 1회 (내 좋아요 여부)
+    """
+    post_ids, oids = _like_status_batch(post_ids)
+    totals = {
+        str(post["_id"]): post.get("likes", 0)
+        async for post in post_collection.find({"_id": {"$in": oids}}, {"likes": 1})
+    }
+    liked = await _liked_post_ids(list(totals), user_id)
+    return _format_like_statuses(post_ids, totals, liked)
+
+async def usernames_by_id(user_ids) -> dict:
+    """user_id(문자열) 목록 → {user_id: username} (users 에 $in 1회, username 만 조회)"""
+    oids = _user_oids(user_ids)
+    if not oids:
+        return {}
+    return {
+        str(user["_id"]): user.get("username")
+        async for user in users_collection.find({"_id": {"$in": oids}}, {"username": 1})
+    }
+
+async def get_post_likes_list(post_id: str, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+    """게시글에 좋아요를 누른 사용자 목록 조회 (liked_at 최근순, 커서 페이지네이션)"""
+    post = await post_collection.find_one({"_id": _post_oid(post_id)}, {"likes": 1})
+    if not post:
+        raise HTTPException(status_code=404, detail=POST_NOT_FOUND)
+
+    likes, next_cursor = await apaginate(
+        post_likes_collection, {"post_id": post_id}, cursor, limit,
+        projection=LIKE_LIST_PROJECTION, field="liked_at"
+    )
+    usernames = await usernames_by_id(like["user_id"] for like in likes)
+    return _format_like_list(post_id, post, likes, usernames, next_cursor)
+
+
+# 신고 조회
+async def get_user_damage_reports(user_id: str):
+    # damage_report에는 user_id가 문자열로 저장되어 있으므로 문자열로 검색
+    reports = damage_report_list_collection.find({"user_id": user_id}, REPORT_LIST_PROJECTION)
+    return [_format_user_report(report) async for report in reports]
+
+async def _find_reports_geo(query: dict, cursor: Optional[str], limit: int) -> dict:
+    reports, next_cursor = await apaginate(
+        damage_report_list_collection, query, cursor, limit, projection=REPORT_LIST_PROJECTION
+    )
+    return {
+        "reports": [_report_summary(r) for r in reports],
+        "next_cursor": next_cursor
+    }
+
+async def get_reports_in_bbox(min_lng: float, min_lat: float, max_lng: float, max_lat: float,
+                              main_category: Optional[str] = None, sub_category: Optional[str] = None,
+                              since: Optional[datetime] = None, until: Optional[datetime] = None,
+                              cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+    """지도 화면(bbox) 안의 신고 목록 (최신순)"""
+    polygon = _bbox_filter(min_lng, min_lat, max_lng, max_lat)
+    query = _geo_report_query(polygon, main_category, sub_category, since, until)
+    return await _find_reports_geo(query, cursor, limit)
+
+async def get_reports_nearby(latitude: float, longitude: float, radius_m: float,
+                             main_category: Optional[str] = None, sub_category: Optional[str] = None,
+                             since: Optional[datetime] = None, until: Optional[datetime] = None,
+                             cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+    """중심점 반경 radius_m 안의 신고 목록 (최신순)"""
+    circle = _circle_filter(latitude, longitude, radius_m)
+    query = _geo_report_query(circle, main_category, sub_category, since, until)
+    return await _find_reports_geo(query, cursor, limit)
@@ -0,0 +1,40 @@
+import os
+
+from pymongo import AsyncMongoClient
+
+from app.database import DB_NAME, LIST_READ_PREFERENCE, MONGODB_URI, PoolWaitMetrics, settings
+
+# async 라우트용 커넥션 풀 (이벤트 루프 하나가 많은 요청을 동시에 처리하므로 sync 보다 크게)
+# 타임아웃/압축/재시도 등 나머지는 DatabaseSettings (MONGO_*) 를 그대로 사용
+MONGO_ASYNC_MAX_POOL_SIZE = int(os.getenv("MONGO_ASYNC_MAX_POOL_SIZE", "200"))
+MONGO_ASYNC_MIN_POOL_SIZE = int(os.getenv("MONGO_ASYNC_MIN_POOL_SIZE", "10"))
+MONGO_ASYNC_MAX_CONNECTING = int(os.getenv("MONGO_ASYNC_MAX_CONNECTING", "4"))
+
+async_pool_metrics = PoolWaitMetrics("async")
+
+async_client = AsyncMongoClient(
+    MONGODB_URI,
+    event_listeners=[async_pool_metrics],
+    **{
+        **settings.client_kwargs(),
+        "maxPoolSize": MONGO_ASYNC_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_ASYNC_MIN_POOL_SIZE,
+        "maxConnecting": MONGO_ASYNC_MAX_CONNECTING,
+    },
+    connect=False,  # 첫 요청 때 이벤트 루프 안에서 연결
+)
+async_db = async_client[DB_NAME]
+
+users_collection = async_db["users"]
+post_collection = async_db["post"]
+comments_collection = async_db["comments"]
+post_likes_collection = async_db["post_likes"]
+damage_report_collection = async_db["damage_report"]
+
+# 목록 조회 전용 (database.LIST_READ_PREFERENCE, 기본 secondaryPreferred)
+post_list_collection = post_collection.with_options(read_preference=LIST_READ_PREFERENCE)
+damage_report_list_collection = damage_report_collection.with_options(read_preference=LIST_READ_PREFERENCE)
+
+
+async def close_async_client():
+    await async_client.close()
@@ -1,12 +1,17 @@
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
+from collections import OrderedDict
 from dotenv import load_dotenv
 import os
+import threading
+import time
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from pymongo import MongoClient
 from bson import ObjectId
-from app.database import users_collection
+from bson.errors import InvalidId
+from typing import Optional
+from app.async_database import users_collection
 
 load_dotenv()
 
@@ -14,16 +19,79 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# 사용자 정보 캐시: TTL = 허용하는 최대 지연(초), 0 이면 매 요청 DB 조회
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+# true 이면 토큰에 username/local_id/email 을 넣고, 검증 시 DB 없이 토큰 내용으로 사용자 구성
+AUTH_TOKEN_CLAIMS = os.getenv("AUTH_TOKEN_CLAIMS", "false").lower() == "true"
+
+# 요청 처리에 필요한 필드만 (비밀번호 해시는 캐시하지 않음)
+PRINCIPAL_PROJECTION = {"username": 1, "email": 1, "local_id": 1, "crop_name": 1}
+PRINCIPAL_CLAIMS = ("username", "local_id", "email")
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
+# 토큰이 없어도 통과 (비로그인 허용 엔드포인트용)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login", auto_error=False)
+
+
+class PrincipalCache:
+    """user_id → 사용자 dict (TTL + LRU), 정보 변경 시 invalidate()"""
+
+    def __init__(self, ttl: float = AUTH_CACHE_TTL_SECONDS, capacity: int = AUTH_CACHE_SIZE):
+        self.ttl = ttl
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str):
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(user_id, None)
+            self.misses += 1
+            return None
+
+    def put(self, user_id: str, user: dict):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses, "ttl": self.ttl}
+
+
+principal_cache = PrincipalCache()
+
+
+def invalidate_principal(user_id: str):
+    """사용자 정보(지역, 비밀번호 등)가 바뀌면 호출"""
+    principal_cache.invalidate(user_id)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)):
     to_encode = {"sub": data["user_id"]}
+    if AUTH_TOKEN_CLAIMS:
+        to_encode.update({k: data[k] for k in PRINCIPAL_CLAIMS if k in data})
     expire = datetime.utcnow() + expires_delta
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(token: str = Depends(oauth2_scheme)):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("sub")
@@ -32,8 +100,31 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise HTTPException(status_code=401, detail="Token decode error")
 
-    user = users_collection.find_one({"_id": ObjectId(user_id)})
+    try:
+        user_oid = ObjectId(user_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    # 토큰에 필요한 정보가 다 있으면 DB 조회 없음 (토큰 만료 전까지는 발급 시점 정보)
+    if AUTH_TOKEN_CLAIMS and all(k in payload for k in PRINCIPAL_CLAIMS):
+        return {"_id": user_oid, **{k: payload[k] for k in PRINCIPAL_CLAIMS}}
+
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        return dict(cached)
+
+    user = await users_collection.find_one({"_id": user_oid}, PRINCIPAL_PROJECTION)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return user
+    principal_cache.put(user_id, user)
+    return dict(user)
+
+async def get_optional_user(token: Optional[str] = Depends(optional_oauth2_scheme)):
+    """토큰이 없거나 잘못됐거나(만료 포함) 사용자가 없으면 None (비로그인으로 취급)"""
+    if not token:
+        return None
+    try:
+        return await get_current_user(token)
+    except HTTPException:
+        return None
@@ -0,0 +1,80 @@
+"""
+blob 참조 카운트 (blob_refs 컬렉션, _id = sha256)
+- 같은 사진은 한 번만 저장되므로 여러 신고가 blob 하나를 공유할 수 있음 → 요청 단위로 바로 지우지 않음
+- 업로드/변형본 저장 시 retain(), 신고 저장에 실패하면 release()
+- 파일 삭제는 참조가 0 인 채로 유예 시간이 지나고 어떤 신고도 참조하지 않는 것만 (collect_garbage)
+"""
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from pymongo import UpdateOne
+
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+# 참조가 0 이 된 뒤 실제로 지우기까지 기다리는 시간 (동시에 같은 사진을 올리는 요청 보호)
+BLOB_GC_GRACE_SECONDS = int(os.getenv("BLOB_GC_GRACE_SECONDS", str(24 * 3600)))
+
+blob_refs_collection = db["blob_refs"]
+
+
+def retain(keys: Iterable[str]):
+    now = datetime.utcnow()
+    ops = [
+        UpdateOne({"_id": key}, {"$inc": {"refs": 1}, "$set": {"updated_at": now}}, upsert=True)
+        for key in keys
+    ]
+    if ops:
+        blob_refs_collection.bulk_write(ops, ordered=False)
+
+
+def track(keys: Iterable[str]):
+    """참조 없이 남은 blob 을 정리 대상에 등록 (이미 참조 중인 blob 의 카운트는 그대로)"""
+    now = datetime.utcnow()
+    ops = [
+        UpdateOne({"_id": key}, {"$inc": {"refs": 0}, "$set": {"updated_at": now}}, upsert=True)
+        for key in keys
+    ]
+    if ops:
+        blob_refs_collection.bulk_write(ops, ordered=False)
+
+
+def release(keys: Iterable[str]):
+    now = datetime.utcnow()
+    ops = [
+        UpdateOne({"_id": key}, {"$inc": {"refs": -1}, "$set": {"updated_at": now}})
+        for key in keys
+    ]
+    if ops:
+        blob_refs_collection.bulk_write(ops, ordered=False)
+
+
+def _report_reference_query(key: str, thumbnail_sizes) -> dict:
+    paths = ["files.sha256", "files.variants.model.sha256"]
+    paths += [f"files.variants.thumbnails.{size}.sha256" for size in thumbnail_sizes]
+    return {"$or": [{path: key} for path in paths]}
+
+
+def collect_garbage(store, reports_collection, thumbnail_sizes,
+                    grace_seconds: int = BLOB_GC_GRACE_SECONDS, dry_run: bool = False) -> int:
+    """참조 0 + 유예 시간 경과 + 신고에서 참조하지 않는 blob 삭제, 삭제한 개수 반환"""
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    query = {"refs": {"$lte": 0}, "updated_at": {"$lt": cutoff}}
+    removed = 0
+    for ref in list(blob_refs_collection.find(query, {"_id": 1})):
+        key = ref["_id"]
+        # 참조 카운트 도입 전 신고가 쓰는 blob 일 수 있음
+        if reports_collection.find_one(_report_reference_query(key, thumbnail_sizes), {"_id": 1}):
+            continue
+        if dry_run:
+            removed += 1
+            continue
+        # 그 사이 다른 요청이 retain 했으면 매칭되지 않음
+        if not blob_refs_collection.delete_one({"_id": key, **query}).deleted_count:
+            continue
+        store.delete(key)
+        removed += 1
+    return removed
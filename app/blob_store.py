@@ -0,0 +1,279 @@
+import hashlib
+import io
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_BLOB_DIR = BASE_DIR / "static" / "uploads" / "blobs"
+
+CHUNK_SIZE = 64 * 1024
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# 매직 바이트 → content type
+IMAGE_SIGNATURES = [
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+]
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, content_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return None
+
+
+EXIF_ORIENTATION = 0x0112
+
+
+def oriented_size(image):
+    """EXIF 회전(exif_transpose)을 적용했을 때의 (가로, 세로) - 디코드 없이 헤더만 사용"""
+    width, height = image.size
+    if image.getexif().get(EXIF_ORIENTATION) in (5, 6, 7, 8):  # 90/270도 회전
+        return height, width
+    return width, height
+
+
+def image_dimensions(source):
+    """헤더만 읽어서 EXIF 회전 기준 (가로, 세로) 반환, 이미지가 아니면 (None, None) - bytes 또는 파일 객체"""
+    from PIL import Image
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    try:
+        with Image.open(source) as image:
+            return oriented_size(image)
+    except Exception:
+        return None, None
+
+
+class BlobWriter(ABC):
+    """청크 단위로 쓰면서 SHA-256 을 계산하는 writer (commit 시 키가 정해짐)"""
+
+    def __init__(self):
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes):
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    @abstractmethod
+    def commit(self) -> str:
+        ...
+
+    @abstractmethod
+    def abort(self):
+        ...
+
+
+class BlobStore(ABC):
+    """SHA-256 기반 콘텐츠 주소 저장소 (백엔드 공통 인터페이스)"""
+
+    @abstractmethod
+    def writer(self) -> BlobWriter:
+        ...
+
+    def put(self, data: bytes) -> str:
+        writer = self.writer()
+        try:
+            writer.write(data)
+            return writer.commit()
+        except BaseException:
+            writer.abort()
+            raise
+
+    @abstractmethod
+    def open(self, key: str):
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    def iter_range(self, key: str, start: int = 0, end: Optional[int] = None,
+                   chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        ...
+
+    def read(self, key: str) -> bytes:
+        return b"".join(self.iter_range(key))
+
+    @staticmethod
+    def check_key(key: str) -> str:
+        if not SHA256_RE.match(key or ""):
+            raise HTTPException(status_code=400, detail="유효하지 않은 파일 키입니다.")
+        return key
+
+
+class LocalBlobStore(BlobStore):
+    """로컬 파일시스템 백엔드: root/ab/cd/abcd... 형태로 저장"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key: str) -> Path:
+        key = self.check_key(key)
+        return self.root / key[:2] / key[2:4] / key
+
+    def writer(self) -> BlobWriter:
+        return LocalBlobWriter(self)
+
+    def open(self, key: str):
+        return open(self.path_for(key), "rb")
+
+    def exists(self, key: str) -> bool:
+        return self.path_for(key).exists()
+
+    def size(self, key: str) -> int:
+        return self.path_for(key).stat().st_size
+
+    def delete(self, key: str):
+        try:
+            os.unlink(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    def iter_range(self, key: str, start: int = 0, end: Optional[int] = None,
+                   chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        path = self.path_for(key)
+        if end is None:
+            end = path.stat().st_size - 1
+        remaining = end - start + 1
+        with open(path, "rb") as f:
+            f.seek(start)
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+
+class LocalBlobWriter(BlobWriter):
+    """root/.tmp 에 임시 파일로 쓰고 commit 시 해시 경로로 이동"""
+
+    def __init__(self, store: LocalBlobStore):
+        super().__init__()
+        self.store = store
+        tmp_dir = store.root / ".tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=tmp_dir, prefix="upload-")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes):
+        super().write(chunk)
+        self._file.write(chunk)
+
+    def commit(self) -> str:
+        self._file.close()
+        key = self.sha256
+        path = self.store.path_for(key)
+        if path.exists():  # 같은 사진은 한 번만 저장
+            os.unlink(self._tmp_path)
+            return key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._tmp_path, path)
+        return key
+
+    def abort(self):
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+
+
+BLOB_BACKENDS = {
+    "local": lambda: LocalBlobStore(os.getenv("BLOB_STORE_DIR", str(DEFAULT_BLOB_DIR))),
+}
+
+
+@lru_cache(maxsize=1)
+def get_blob_store() -> BlobStore:
+    backend = os.getenv("BLOB_STORE_BACKEND", "local")
+    if backend not in BLOB_BACKENDS:
+        raise RuntimeError(f"지원하지 않는 BLOB_STORE_BACKEND 입니다: {backend}")
+    return BLOB_BACKENDS[backend]()
+
+
+def _parse_range(range_header: str, total: int):
+    """단일 구간 Range 헤더 파싱 → (start, end), 범위를 벗어나면 416"""
+    match = re.match(r"^bytes=(\d*)-(\d*)$", range_header.strip())
+    if not match or (not match.group(1) and not match.group(2)):
+        raise HTTPException(status_code=416, detail="잘못된 Range 요청입니다.",
+                            headers={"Content-Range": f"bytes */{total}"})
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), total - 1) if last else total - 1
+    else:  # bytes=-N (마지막 N 바이트)
+        start = max(total - int(last), 0)
+        end = total - 1
+    if start > end or start >= total:
+        raise HTTPException(status_code=416, detail="잘못된 Range 요청입니다.",
+                            headers={"Content-Range": f"bytes */{total}"})
+    return start, end
+
+
+def blob_response(key: str, range_header: Optional[str] = None,
+                  if_none_match: Optional[str] = None,
+                  media_type: Optional[str] = None,
+                  store: Optional[BlobStore] = None) -> Response:
+    """ETag / Range 를 지원하는 스트리밍 응답"""
+    store = store or get_blob_store()
+    store.check_key(key)
+    if not store.exists(key):
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+
+    etag = f'"{key}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        # 콘텐츠 주소 기반이라 내용이 절대 바뀌지 않음
+        "Cache-Control": "public, max-age=31536000, immutable",
+    }
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    total = store.size(key)
+    if media_type is None:
+        head = next(store.iter_range(key, 0, min(15, total - 1)), b"") if total else b""
+        media_type = sniff_content_type(head) or "application/octet-stream"
+
+    if range_header:
+        start, end = _parse_range(range_header, total)
+        headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(store.iter_range(key, start, end), status_code=206,
+                                 media_type=media_type, headers=headers)
+
+    headers["Content-Length"] = str(total)
+    return StreamingResponse(store.iter_range(key), media_type=media_type, headers=headers)
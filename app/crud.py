@@ -2,10 +2,10 @@ from app.database import users_collection, post_collection, comments_collection,
 from app.models import UserRegister
 from app.models import UserLogin
 from datetime import datetime
-import bcrypt
 from bson import ObjectId
 from fastapi import HTTPException, UploadFile
-from .database import users_collection, db
+from starlette.concurrency import run_in_threadpool
+from .database import users_collection, db, damage_report_list_collection
 import os
 import shutil
 from app.constants import LOCAL_CODES, DAMAGE_CATEGORIES
@@ -16,48 +16,28 @@ import json
 import logging
 from pathlib import Path
 from typing import Optional, List
-import torch
-from PIL import Image
 import io
-import pandas as pd
-import numpy as np
-from ultralytics import YOLO
-from bs4 import BeautifulSoup
-import requests
 import re
 from urllib.parse import urljoin
 from app import schemas
+from app import blob_refs
+from app.blob_store import get_blob_store, image_dimensions, sniff_content_type
+from app.inference import InferenceScheduler
+from app.detection_cache import detection_cache
+from app.model_registry import model_registry
+from app.model_backends import load_backend, model_path_for
+from app.jobs import JobQueue, detection_jobs_collection
+from app.image_pipeline import smallest_thumbnail_url, thumbnail_urls
+from app.tiles import quadkey_for, record_report_tiles
+from app.report_feed import report_feed
+from app.recent_reports import recent_reports
 import base64
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
-def create_user(user : UserRegister) :
-    if users_collection.find_one({"email":user.email}) :
-        raise ValueError("⚠️ 이미 등록된 이메일입니다.")
-    
-    hashed_pw = bcrypt.hashpw(user.password.encode("utf-8"),bcrypt.gensalt())
-
-    user_dict = user.dict()
-    user_dict['password'] = hashed_pw.decode("utf-8")
-    user_dict['crop_name']
-    user_dict['create_date'] = datetime.utcnow()
-
-    users_collection.insert_one(user_dict)
-
-
-def authenticate_user(login_data : UserLogin) :
-    user = users_collection.find_one({'email':login_data.email})
-    if not user :
-        return None # 존재하지 않는 사용자
-    
-    if not bcrypt.checkpw(login_data.password.encode("utf-8"),user['password'].encode("utf-8")) :
-        return None # 비밀번호 틀림
-    
-    return user # 인증 성공 시 사용자 정보 반환
-
-def get_user_mypage(user_id: str):
-    user = users_collection.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=404, detail="❌ 사용자 정보를 찾을 수 없습니다.")
-    
+# ---- 커뮤니티/조회 기능의 공통 헬퍼 (쿼리 실행은 async_crud.py) ----
+
+def _format_mypage(user: dict) -> dict:
     return {
         "username": user["username"],
         "email": user["email"],
@@ -67,7 +47,7 @@ def get_user_mypage(user_id: str):
         # "profile_image": user.get("profile_image", "")
     }
 
-def update_user_mypage(user_id: str, update_data: dict):
+def _mypage_update_fields(update_data: dict) -> dict:
     update_fields = {}
 
     if update_data.get("crop_name") is not None:
@@ -79,20 +59,7 @@ def update_user_mypage(user_id: str, update_data: dict):
 
     if not update_fields:
         raise ValueError("⚠️ 업데이트할 값이 없습니다.")
-
-    users_collection.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$set": update_fields}
-    )
-
-def change_user_password(user_id: str, current_pw: str, new_pw: str):
-    user = users_collection.find_one({"_id" : ObjectId(user_id)})
-
-    if not user or not bcrypt.checkpw(current_pw.encode(), user["password"].encode()):
-       raise HTTPException(status_code=400, detail="⚠️ 현재 비밀번호가 올바르지 않습니다.")
-    
-    new_hashed = bcrypt.hashpw(new_pw.encode(), bcrypt.gensalt()).decode()
-    users_collection.update_one({"_id": ObjectId(user_id)}, {"$set": {"password": new_hashed}})
+    return update_fields
 
 
 # 프로필 사진 (주석처리)
@@ -119,8 +86,8 @@ def change_user_password(user_id: str, current_pw: str, new_pw: str):
 #     return url
 
 
-def create_post(user: dict, post_data: dict):
-    post = {
+def _new_post(user: dict, post_data: dict) -> dict:
+    return {
         "user_id": str(user["_id"]),
         "username": user["username"],
         "title": post_data["title"],
@@ -128,32 +95,41 @@ def create_post(user: dict, post_data: dict):
         "tags": post_data.get("tags", []),
         "local_id": user["local_id"],
         "created_at": datetime.utcnow(),
-        "likes": 0
+        "likes": 0,
+        "comment_count": 0,
+        "recent_comments": []
     }
-    post_collection.insert_one(post)
-    return post
 
-def get_all_posts_with_index():
-    posts = post_collection.find().sort("created_at", -1)
+POST_LIST_PROJECTION = {"title": 1, "username": 1, "created_at": 1, "likes": 1, "comment_count": 1}
 
+
+def _format_post_list(posts: list) -> list:
     result = []
-    for idx, post in enumerate(posts, start=1):  # ← 번호 붙이기
+    for post in posts:
         result.append({
-            "no": idx,
             "id": str(post["_id"]),
             "title": post["title"],
             "username": post["username"],
             "created_at": post["created_at"].strftime("%Y-%m-%d %H:%M"),  # 날짜 포맷
-            "likes": post.get("likes", 0)
+            "likes": post.get("likes", 0),
+            "comment_count": post.get("comment_count", 0)
         })
-
     return result
 
 
-def get_post_detail(post_id: str):
-    post = post_collection.find_one({"_id": ObjectId(post_id)})
-    if not post:
-        raise HTTPException(status_code=404, detail="⚠️ 게시글을 찾을 수 없습니다.")
+def _check_local_id(local_id: int):
+    if not isinstance(local_id, int) or local_id not in LOCAL_CODES:
+        raise HTTPException(status_code=400, detail="❌ 잘못된 지역 코드입니다.")
+
+
+def _post_oid(post_id: str) -> ObjectId:
+    try:
+        return ObjectId(post_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 게시글 ID입니다.")
+
+
+def _format_post_detail(post: dict) -> dict:
     return {
         "id": str(post["_id"]),
         "user_id": post["user_id"],
@@ -161,252 +137,167 @@ def get_post_detail(post_id: str):
         "title": post["title"],
         "content": post["content"],
         "tags": post.get("tags", []),
-        "created_at": post["created_at"]
+        "created_at": post["created_at"],
+        "comment_count": post.get("comment_count", 0),
+        "recent_comments": [_format_comment_preview(c) for c in post.get("recent_comments", [])]
     }
 
-def update_post(post_id: str, user_id: str, update_data: dict):
-    post = post_collection.find_one({"_id": ObjectId(post_id)})
+
+def _check_post_owner(post: Optional[dict], user_id: str, action: str):
     if not post:
         raise HTTPException(status_code=404, detail="⚠️ 게시글을 찾을 수 없습니다.")
     if post["user_id"] != user_id:
-        raise HTTPException(status_code=403, detail="❌ 수정 권한이 없습니다.")
+        raise HTTPException(status_code=403, detail=f"❌ {action} 권한이 없습니다.")
+
 
+def _post_update_fields(update_data: dict) -> dict:
     update_fields = {k: v for k, v in update_data.items() if v is not None}
     if not update_fields:
         raise HTTPException(status_code=400, detail="⚠️ 수정할 내용이 없습니다.")
+    return update_fields
 
-    post_collection.update_one(
-        {"_id": ObjectId(post_id)},
-        {"$set": update_fields}
-    )
 
-def delete_post(post_id: str, user_id: str):
-    post = post_collection.find_one({"_id": ObjectId(post_id)})
-    if not post:
-        raise HTTPException(status_code=404, detail="⚠️ 게시글을 찾을 수 없습니다.")
-    if post["user_id"] != user_id:
-        raise HTTPException(status_code=403, detail="❌ 삭제 권한이 없습니다.")
+# 게시글 문서에 함께 저장하는 최신 댓글 미리보기 개수 / 글자 수
+COMMENT_PREVIEW_SIZE = int(os.getenv("COMMENT_PREVIEW_SIZE", "3"))
+COMMENT_PREVIEW_LENGTH = 100
+COMMENT_LIST_PROJECTION = {"user_id": 1, "username": 1, "content": 1, "created_at": 1}
 
-    post_collection.delete_one({"_id": ObjectId(post_id)})
+def comment_preview(comment: dict) -> dict:
+    return {
+        "id": str(comment["_id"]),
+        "user_id": comment["user_id"],
+        "username": comment["username"],
+        "content": comment["content"][:COMMENT_PREVIEW_LENGTH],
+        "created_at": comment["created_at"]
+    }
 
+def _format_comment_preview(preview: dict) -> dict:
+    return {**preview, "created_at": preview["created_at"].strftime("%Y-%m-%d %H:%M:%S")}
 
-def add_comment(user: dict, comment_data: dict):
-    comment = {
+def _new_comment(user: dict, comment_data: dict) -> dict:
+    return {
         "post_id": comment_data["post_id"],
         "user_id": str(user["_id"]),
         "username": user["username"],
         "content": comment_data["content"],
         "created_at": datetime.utcnow()
     }
-    comments_collection.insert_one(comment)
-    return comment
 
-def update_comment(comments_id: str, users_id: str, new_content: str):
-    try:
-        comment_oid = ObjectId(comments_id)
-        user_oid = ObjectId(users_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="유효하지 않은 ID 형식입니다.")
-
-    # 🔍 문제점: comments 컬렉션에서 users_id 필드로 찾고 있음
-    # 실제로는 user_id 필드를 사용해야 함
-    result = comments_collection.update_one(
-        {"_id": comment_oid, "user_id": users_id},  # ✅ users_id → user_id로 수정
-        {"$set": {"content": new_content}}
-    )
+def _comment_added_update(comment: dict) -> dict:
+    """댓글 수 +1, 미리보기 맨 앞에 추가 (최대 COMMENT_PREVIEW_SIZE 개 유지) - 한 번의 원자적 갱신"""
+    return {
+        "$inc": {"comment_count": 1},
+        "$push": {"recent_comments": {
+            "$each": [comment_preview(comment)],
+            "$position": 0,
+            "$slice": COMMENT_PREVIEW_SIZE
+        }}
+    }
 
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="댓글을 찾을 수 없거나 수정 권한이 없습니다.")
+def _comment_removed_pipeline(comments_id: str) -> list:
+    """댓글 수 -1 (0 미만 방지) + 미리보기에서 제거 - 파이프라인 업데이트 한 번"""
+    return [{"$set": {
+        "comment_count": {"$max": [0, {"$subtract": [{"$ifNull": ["$comment_count", 0]}, 1]}]},
+        "recent_comments": {"$filter": {
+            "input": {"$ifNull": ["$recent_comments", []]},
+            "cond": {"$ne": ["$$this.id", comments_id]}
+        }}
+    }}]
 
+def _preview_was_removed(before: Optional[dict], comments_id: str) -> bool:
+    return bool(before) and any(p.get("id") == comments_id for p in before.get("recent_comments", []))
 
-def delete_comment(comments_id: str, users_id: str):
+def _comment_oid(comments_id: str, users_id: str) -> ObjectId:
     try:
-        comment_oid = ObjectId(comments_id)
-        user_oid = ObjectId(users_id)
-    except Exception:
+        ObjectId(users_id)
+        return ObjectId(comments_id)
+    except (InvalidId, TypeError):
         raise HTTPException(status_code=400, detail="유효하지 않은 ID 형식입니다.")
 
-    # 🔍 마찬가지로 delete_comment도 수정 필요
-    result = comments_collection.delete_one(
-        {"_id": comment_oid, "user_id": users_id}  # ✅ users_id → user_id로 수정
-    )
-
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="댓글을 찾을 수 없거나 삭제 권한이 없습니다.")
-
-def get_comments_by_post(post_id: str):
-    """특정 게시글의 댓글 목록 조회"""
+def _comment_post_oid(comment: dict) -> Optional[ObjectId]:
     try:
-        # 게시글이 존재하는지 먼저 확인
-        post = post_collection.find_one({"_id": ObjectId(post_id)})
-        if not post:
-            raise HTTPException(status_code=404, detail="⚠️ 게시글을 찾을 수 없습니다.")
-        
-        # 댓글 조회 (최신순)
-        comments = comments_collection.find({"post_id": post_id}).sort("created_at", -1)
-        
-        result = []
-        for comment in comments:
-            result.append({
-                "id": str(comment["_id"]),
-                "user_id": comment["user_id"],
-                "username": comment["username"],
-                "content": comment["content"],
-                "created_at": comment["created_at"].strftime("%Y-%m-%d %H:%M:%S")
-            })
-        
-        return result
-    
-    except Exception as e:
-        raise HTTPException(status_code=400, detail="잘못된 게시글 ID입니다.")
-    
-def get_user_damage_reports(users: str):
-    reports = db.damage_report.find({"user_id": ObjectId(users)})
+        return ObjectId(comment["post_id"])
+    except (InvalidId, TypeError):
+        return None
 
-    result = []
-    for report in reports:
-        result.append({
-            "id": str(report["_id"]),
-            "main_category": report.get("main_category"),
-            "sub_category": report.get("sub_category"),
-            "title": report.get("title"),
-            "latitude" : report.get("latitude"),
-            "longitude" : report.get("longitude")
-        })
-    return result
-
-def toggle_like_post(post_id: str, user_id: str):
-    # 중복 방지: user-post 조합이 이미 있는지 확인
-    existing = post_likes_collection.find_one({"post_id": post_id, "user_id": user_id})
-
-    if existing:
-        # 좋아요 취소
-        post_likes_collection.delete_one({"_id": existing["_id"]})
-        post_collection.update_one(
-            {"_id": ObjectId(post_id)},
-            {"$inc": {"likes": -1}}
-        )
-        return {"liked": False}
-    else:
-        # 좋아요 추가
-        post_likes_collection.insert_one({
-            "post_id": post_id,
-            "user_id": user_id,
-            "liked_at": datetime.utcnow()
-        })
-        post_collection.update_one(
-            {"_id": ObjectId(post_id)},
-            {"$inc": {"likes": 1}}
-        )
-        return {"liked": True}
-    
-from bson import ObjectId
-
-def get_like_status(post_id: str, user_id: str):
-    """특정 사용자의 게시글 좋아요 상태 조회"""
-    try:
-        # 게시글이 존재하는지 확인
-        post = post_collection.find_one({"_id": ObjectId(post_id)})
-        if not post:
-            raise HTTPException(status_code=404, detail="⚠️ 게시글을 찾을 수 없습니다.")
-        
-        # 사용자가 좋아요를 눌렀는지 확인
-        like_record = post_likes_collection.find_one({
-            "post_id": post_id,
-            "user_id": user_id
-        })
-        
-        # 전체 좋아요 수
-        total_likes = post.get("likes", 0)
-        
-        return {
-            "post_id": post_id,
-            "user_liked": like_record is not None,
-            "total_likes": total_likes
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=400, detail="잘못된 게시글 ID입니다.")
-
-
-def get_post_likes_list(post_id: str, limit: int = 20):
-    """게시글에 좋아요를 누른 사용자 목록 조회"""
-    try:
-        # 게시글이 존재하는지 확인
-        post = post_collection.find_one({"_id": ObjectId(post_id)})
-        if not post:
-            raise HTTPException(status_code=404, detail="⚠️ 게시글을 찾을 수 없습니다.")
-        
-        # 좋아요를 누른 사용자들 조회 (최근순)
-        likes = post_likes_collection.find({"post_id": post_id}).sort("liked_at", -1).limit(limit)
-        
-        user_list = []
-        for like in likes:
-            user = users_collection.find_one({"_id": ObjectId(like["user_id"])})
-            if user:
-                user_list.append({
-                    "user_id": like["user_id"],
-                    "username": user["username"],
-                    "liked_at": like["liked_at"].strftime("%Y-%m-%d %H:%M:%S")
-                })
-        
-        return {
-            "post_id": post_id,
-            "likes": user_list,
-            "total": len(user_list)
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=400, detail="잘못된 게시글 ID입니다.")
+def _format_comment_page(post_id: str, comments: list, next_cursor: Optional[str], total) -> dict:
+    return {
+        "post_id": post_id,
+        "comments": [{
+            "id": str(comment["_id"]),
+            "user_id": comment["user_id"],
+            "username": comment["username"],
+            "content": comment["content"],
+            "created_at": comment["created_at"].strftime("%Y-%m-%d %H:%M:%S")
+        } for comment in comments],
+        "next_cursor": next_cursor,
+        "total": total
+    }
 
 
-def cancel_like_count(post_id: str):
-    try:
-        oid = ObjectId(post_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="유효하지 않은 post_id 형식입니다.")
+def _new_like(post_id: str, user_id: str) -> dict:
+    return {"post_id": post_id, "user_id": user_id, "liked_at": datetime.utcnow()}
 
-    post = db.post.find_one({"_id": oid})
-    if not post:
-        raise HTTPException(status_code=404, detail="게시글이 존재하지 않습니다.")
+def _like_result(post_id: str, liked: bool, changed: bool, post: Optional[dict]) -> dict:
+    return {
+        "post_id": post_id,
+        "liked": liked,
+        "changed": changed,
+        "total_likes": post.get("likes", 0) if post else None
+    }
 
-    current_likes = post.get("likes", 0)
-    new_likes = max(0, current_likes - 1)
+MAX_LIKE_STATUS_BATCH = 200
 
-    db.post.update_one({"_id": oid}, {"$set": {"likes": new_likes}})
-    return {"message": "❌ 좋아요가 취소되었습니다."}
+def _like_status_batch(post_ids: List[str]):
+    """순서 유지 중복 제거 + 개수 제한 → (post_ids, ObjectId 리스트)"""
+    post_ids = list(dict.fromkeys(post_ids))
+    if len(post_ids) > MAX_LIKE_STATUS_BATCH:
+        raise HTTPException(status_code=400, detail=f"⚠️ 게시글은 한 번에 최대 {MAX_LIKE_STATUS_BATCH}개까지 조회할 수 있습니다.")
+    return post_ids, [_post_oid(post_id) for post_id in post_ids]
 
+def _format_like_statuses(post_ids: List[str], totals: dict, liked: set) -> dict:
+    return {
+        "statuses": [
+            {"post_id": post_id, "liked": post_id in liked, "total_likes": totals[post_id]}
+            for post_id in post_ids if post_id in totals
+        ],
+        "missing": [post_id for post_id in post_ids if post_id not in totals]
+    }
 
-def get_posts_by_local(local_id: int):
-    # local_id 유효성 검사
-    if not isinstance(local_id, int) or local_id not in LOCAL_CODES:
-        raise HTTPException(status_code=400, detail="❌ 잘못된 지역 코드입니다.")
-    
-    posts = post_collection.find({"local_id": local_id}).sort("created_at", -1)
+def _user_oids(user_ids) -> list:
+    oids = []
+    for user_id in set(user_ids):
+        try:
+            oids.append(ObjectId(user_id))
+        except (InvalidId, TypeError):
+            continue
+    return oids
 
-    result = []
-    for idx, post in enumerate(posts, start=1):
-        result.append({
-            "no": idx,
-            "id": str(post["_id"]),
-            "title": post["title"],
-            "username": post["username"],
-            "created_at": post["created_at"].strftime("%Y-%m-%d %H:%M"),
-            "likes": post.get("likes", 0)
-        })
+LIKE_LIST_PROJECTION = {"user_id": 1, "liked_at": 1}
 
-    return result
+def _format_like_list(post_id: str, post: dict, likes: list, usernames: dict, next_cursor: Optional[str]) -> dict:
+    return {
+        "post_id": post_id,
+        "likes": [{
+            "user_id": like["user_id"],
+            "username": usernames[like["user_id"]],
+            "liked_at": like["liked_at"].strftime("%Y-%m-%d %H:%M:%S")
+        } for like in likes if usernames.get(like["user_id"]) is not None],  # 탈퇴한 사용자 제외
+        "next_cursor": next_cursor,
+        "total": post.get("likes", 0)
+    }
 
 
 BASE_DIR = Path(__file__).parent.absolute()
 REPORT_DIR = BASE_DIR / "static" / "uploads" / "reports"
 
+# 등록 시 자동 탐지 대상 sub_category
+DETECTION_SUB_CATEGORIES = ("해충", "병해")
+
 ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff'}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_REQUEST_SIZE = int(os.getenv("MAX_REPORT_UPLOAD_SIZE", str(50 * 1024 * 1024)))  # 신고 1건 전체 업로드 한도
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
 logger = logging.getLogger(__name__)
 
@@ -417,27 +308,111 @@ def get_current_user():
         "email": "test@example.com"
     }
 
-def validate_file(file: UploadFile) -> bool:
+def validate_file(file: UploadFile, head: bytes = b"") -> bool:
     file_ext = Path(file.filename).suffix.lower()
     if file_ext not in ALLOWED_EXTENSIONS:
         return False
     if not file.content_type or not file.content_type.startswith('image/'):
         return False
+    # 확장자/헤더는 클라이언트가 정하는 값이라 실제 내용의 매직 바이트도 확인
+    if head and sniff_content_type(head) is None:
+        return False
     return True
 
-# 🔥 수정된 파일 업로드 함수
-async def save_uploaded_file_base64(file: UploadFile) -> dict:
-    content = await file.read()
-    if len(content) > 10 * 1024 * 1024:
+# 업로드 파일을 청크 단위로 읽으면서 바로 blob store 에 저장 (메모리 사용량 = 청크 크기)
+async def save_uploaded_file(file: UploadFile, max_total: int = MAX_REQUEST_SIZE,
+                             blob_keys: Optional[list] = None) -> dict:
+    """
+    업로드 파일을 blob store 에 저장 (디스크 쓰기는 스레드풀에서)
+    - 요청 본문은 이미 Starlette 가 임시 파일로 받아 둔 상태 → 여기서는 파일별/신고별 한도만 검사
+    - commit 전에 참조 카운트를 올리고 blob_keys 에 추가 (신고 저장 실패 시 release)
+    """
+    limit = min(MAX_FILE_SIZE, max_total)
+    # 크기를 미리 알 수 있으면 읽기 전에 거절
+    if file.size is not None and file.size > limit:
         raise HTTPException(status_code=413, detail="파일 크기가 너무 큽니다.")
-    
-    encoded_str = base64.b64encode(content).decode("utf-8")
+    if not validate_file(file):
+        raise HTTPException(status_code=415, detail="지원하지 않는 파일 형식입니다.")
+
+    store = get_blob_store()
+    writer = await run_in_threadpool(store.writer)
+    head = b""
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            if not head:
+                head = chunk[:16]
+                if not validate_file(file, head):
+                    raise HTTPException(status_code=415, detail="이미지 파일이 아닙니다.")
+            if writer.size + len(chunk) > limit:
+                raise HTTPException(status_code=413, detail="파일 크기가 너무 큽니다.")
+            await run_in_threadpool(writer.write, chunk)
+        if not head:
+            raise HTTPException(status_code=400, detail="빈 파일입니다.")
+        sha256 = await run_in_threadpool(_retain_and_commit, writer)
+    except BaseException:
+        await run_in_threadpool(writer.abort)
+        raise
+    if blob_keys is not None:
+        blob_keys.append(sha256)
+
+    width, height = await run_in_threadpool(_blob_dimensions, store, sha256)
     return {
         "original_filename": file.filename,
-        "content_type": file.content_type,
-        "base64_data": encoded_str
+        "content_type": sniff_content_type(head),
+        "sha256": sha256,
+        "size": writer.size,
+        "width": width,
+        "height": height
     }
 
+def _blob_dimensions(store, sha256: str):
+    with store.open(sha256) as f:
+        return image_dimensions(f)
+
+def _retain_and_commit(writer) -> str:
+    # 참조를 먼저 잡아야 같은 blob 을 동시에 정리하는 쪽이 지우지 않음
+    blob_refs.retain([writer.sha256])
+    try:
+        return writer.commit()
+    except BaseException:
+        blob_refs.release([writer.sha256])
+        raise
+
+def release_blobs(keys: list):
+    """신고 저장에 실패했을 때 이번 요청이 잡은 blob 참조 해제 (파일 삭제는 collect_blob_garbage 에서)"""
+    try:
+        blob_refs.release(keys)
+    except Exception:
+        logger.warning("⚠️ blob 참조 해제 실패 %s", keys, exc_info=True)
+
+def read_report_file(file_info: dict) -> bytes:
+    """신고 첨부파일 원본 바이트 (blob 참조 또는 마이그레이션 전 base64)"""
+    if file_info.get("sha256"):
+        return get_blob_store().read(file_info["sha256"])
+    if file_info.get("base64_data"):
+        return base64.b64decode(file_info["base64_data"])
+    raise HTTPException(status_code=400, detail="파일에 저장된 데이터가 없습니다.")
+
+def geo_point(latitude, longitude):
+    """위도/경도 → GeoJSON Point (2dsphere 인덱스용), 둘 중 하나라도 없으면 None"""
+    if not latitude or not longitude:
+        return None
+    try:
+        lat, lng = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="⚠️ 위도/경도 형식이 올바르지 않습니다.")
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise HTTPException(status_code=400, detail="⚠️ 위도/경도 범위를 벗어났습니다.")
+    return {"type": "Point", "coordinates": [lng, lat]}
+
+def _after_insert(action: str, fn, *args, **kwargs) -> bool:
+    try:
+        fn(*args, **kwargs)
+        return True
+    except Exception:
+        logger.exception("⚠️ 신고 저장 후 %s 실패", action)
+        return False
+
 def create_damage_report(
     user: dict,
     main_category: str,
@@ -448,7 +423,10 @@ def create_damage_report(
     latitude: str,
     longitude: str,
     file_info: list
-) -> str:
+) -> dict:
+    # 위도/경도 검증은 geo_point 에서 (형식/범위 오류는 400), 저장 값도 검증된 값을 사용
+    location = geo_point(latitude, longitude)
+    lng, lat = location["coordinates"] if location else (None, None)
     report_data = {
         "user_id": str(user["_id"]),
         "username": user.get("username"),
@@ -458,43 +436,91 @@ def create_damage_report(
         "title": title,
         "content": content,
         "local": local,
-        "latitude": float(latitude) if latitude else None,
-        "longitude": float(longitude) if longitude else None,
+        "latitude": lat,
+        "longitude": lng,
+        "location": location,
         "files": file_info,
         "created_at": datetime.utcnow(),
         "status": "접수완료"
     }
+    report_data["quadkey"] = quadkey_for(lat, lng) if location else None
+
+    # 병해충 신고는 저장과 함께 탐지 작업을 예약 (응답은 모델 실행을 기다리지 않음)
+    job_id = None
+    if sub_category in DETECTION_SUB_CATEGORIES and file_info:
+        job_id = ObjectId()
+        report_data["detection"] = {"status": "queued", "job_id": str(job_id)}
     print("저장할 데이터:", report_data)
 
     result = db.damage_report.insert_one(report_data)
-    
+
     print("inserted_id:", result.inserted_id)
     if not result.inserted_id:
         raise HTTPException(status_code=500, detail="DB 저장 실패")
 
-    return str(result.inserted_id)
+    # 여기부터는 신고가 이미 저장된 상태 → 부가 작업이 실패해도 로그만 남기고 접수 성공으로 응답
+    report = {"_id": result.inserted_id, **report_data}
+    _after_insert("실시간 피드 전달", report_feed.publish_local, report)
+    _after_insert("최근 신고 버퍼 반영", recent_reports.push, report)
+    # 지도 타일 클러스터 집계 반영 (누락분은 rebuild_report_tiles 로 복구)
+    _after_insert("지도 타일 집계", record_report_tiles, report_data["quadkey"], sub_category,
+                  report_data["latitude"], report_data["longitude"])
 
+    if job_id is not None and not _after_insert(
+            "탐지 작업 예약", detection_jobs.enqueue, {"report_id": str(result.inserted_id)}, job_id=job_id):
+        _after_insert("탐지 상태 기록", _mark_detection_failed,
+                      {"_id": job_id, "report_id": str(result.inserted_id)}, "탐지 작업 예약 실패")
 
-def get_user_damage_reports(user_id: str):
-    # damage_report에는 user_id가 문자열로 저장되어 있으므로 문자열로 검색
-    reports = db.damage_report.find({"user_id": user_id})  # ObjectId() 제거!
-    
-    result = []
-    for report in reports:
-        result.append({
-            "id": str(report["_id"]),
-            "main_category": report.get("main_category"),
-            "sub_category": report.get("sub_category"),
-            "title": report.get("title"),
-            "latitude": report.get("latitude"),
-            "longitude": report.get("longitude")
-        })
-    return result
+    return {
+        "report_id": str(result.inserted_id),
+        "detection_job_id": str(job_id) if job_id else None
+    }
+
+
+# 신고 목록에 필요한 필드만 (첨부파일은 썸네일 참조만)
+REPORT_LIST_PROJECTION = {
+    "main_category": 1,
+    "sub_category": 1,
+    "title": 1,
+    "latitude": 1,
+    "longitude": 1,
+    "created_at": 1,
+    "files.variants.thumbnails": 1
+}
 
+def _report_thumbnail_url(report: dict):
+    files = report.get("files") or []
+    return smallest_thumbnail_url(files[0]) if files else None
+
+def _format_user_report(report: dict) -> dict:
+    return {
+        "id": str(report["_id"]),
+        "main_category": report.get("main_category"),
+        "sub_category": report.get("sub_category"),
+        "title": report.get("title"),
+        "latitude": report.get("latitude"),
+        "longitude": report.get("longitude"),
+        "thumbnail_url": _report_thumbnail_url(report)
+    }
 
-def get_damage_report_detail(report_id: str):
+
+def _file_descriptor(report_id: str, index: int, file_info: dict) -> dict:
+    return {
+        "index": index,
+        "original_filename": file_info.get("original_filename"),
+        "content_type": file_info.get("content_type"),
+        "size": file_info.get("size"),
+        "width": file_info.get("width"),
+        "height": file_info.get("height"),
+        "url": f"/report/{report_id}/files/{index}",
+        "thumbnails": thumbnail_urls(file_info)
+    }
+
+def get_damage_report_detail(report_id: str, include_payload: bool = False):
+    # 기본적으로 파일 본문(base64)은 DB 에서 가져오지 않음
+    projection = None if include_payload else {"files.base64_data": 0}
     try:
-        report = db.damage_report.find_one({"_id": ObjectId(report_id)})
+        report = db.damage_report.find_one({"_id": ObjectId(report_id)}, projection)
     except Exception:
         raise HTTPException(status_code=400, detail="유효하지 않은 report_id 형식입니다.")
 
@@ -503,27 +529,99 @@ def get_damage_report_detail(report_id: str):
 
     report["id"] = str(report["_id"])
     del report["_id"]
+    if not include_payload:
+        report["files"] = [
+            _file_descriptor(report["id"], idx, f)
+            for idx, f in enumerate(report.get("files", []))
+        ]
     return report
 
+def get_damage_report_file(report_id: str, file_index: int) -> dict:
+    """신고의 file_index 번째 첨부파일 정보만 조회"""
+    try:
+        oid = ObjectId(report_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="유효하지 않은 report_id 형식입니다.")
+
+    report = db.damage_report.find_one({"_id": oid}, {"files": {"$slice": [file_index, 1]}})
+    if not report:
+        raise HTTPException(status_code=404, detail="신고 내역을 찾을 수 없습니다.")
+    files = report.get("files", [])
+    if not files:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+    return files[0]
+
+def _recent_report_entry(report: dict) -> dict:
+    return {
+        "title": report.get("title", ""),
+        "id" : str(report["_id"]),
+        "main_category": report.get("main_category", ""),
+        "sub_category": report.get("sub_category", ""),
+        # "created_at": report.get("created_at"),
+        # "local": report.get("local", ""),
+        "latitude" : report.get("latitude", ""),
+        "longitude" : report.get("longitude", ""),
+        "thumbnail_url": _report_thumbnail_url(report),
+    }
+
 def get_recent_reports(limit: int = 10):
+    # 최근 신고는 프로세스 내 링 버퍼에서 응답 (용량을 넘는 limit 만 DB 조회)
+    cached = recent_reports.get(limit)
+    if cached is not None:
+        return cached
     try:
-        reports_cursor = db.damage_report.find().sort("created_at", -1).limit(limit)
-        reports = []
-        for report in reports_cursor:
-            reports.append({
-                "title": report.get("title", ""),
-                "id" : str(report["_id"]),
-                "main_category": report.get("main_category", ""),
-                "sub_category": report.get("sub_category", ""),
-                # "created_at": report.get("created_at"),
-                # "local": report.get("local", ""),
-                "latitude" : report.get("latitude", ""),
-                "longitude" : report.get("longitude", ""),
-            })
-        return reports
+        reports_cursor = damage_report_list_collection.find({}, REPORT_LIST_PROJECTION).sort("created_at", -1).limit(limit)
+        return [_recent_report_entry(report) for report in reports_cursor]
     except Exception as e:
         raise HTTPException(status_code=500, detail="신고 목록 조회 중 오류 발생")
 
+def warm_recent_reports():
+    # 버퍼 적재/따라잡기는 primary 에서 (secondary 지연이 skew 창보다 길면 신고가 빠짐)
+    recent_reports.warm(damage_report_collection, REPORT_LIST_PROJECTION, _recent_report_entry)
+    recent_reports.start()
+
+EARTH_RADIUS_M = 6378100
+MAX_RADIUS_M = 50 * 1000
+
+def _report_summary(report: dict) -> dict:
+    return {
+        "id": str(report["_id"]),
+        "title": report.get("title"),
+        "main_category": report.get("main_category"),
+        "sub_category": report.get("sub_category"),
+        "latitude": report.get("latitude"),
+        "longitude": report.get("longitude"),
+        "created_at": report["created_at"],
+        "thumbnail_url": _report_thumbnail_url(report)
+    }
+
+def _geo_report_query(geo_filter: dict, main_category: Optional[str], sub_category: Optional[str],
+                      since: Optional[datetime], until: Optional[datetime]) -> dict:
+    query = {"location": {"$geoWithin": geo_filter}}
+    if main_category:
+        query["main_category"] = main_category
+    if sub_category:
+        query["sub_category"] = sub_category
+    if since or until:
+        query["created_at"] = {}
+        if since:
+            query["created_at"]["$gte"] = since
+        if until:
+            query["created_at"]["$lt"] = until
+    return query
+
+def _bbox_filter(min_lng: float, min_lat: float, max_lng: float, max_lat: float) -> dict:
+    """지도 화면(bbox) → $geoWithin 조건"""
+    if min_lng >= max_lng or min_lat >= max_lat:
+        raise HTTPException(status_code=400, detail="⚠️ 잘못된 영역입니다 (min < max).")
+    return {"$geometry": {"type": "Polygon", "coordinates": [[
+        [min_lng, min_lat], [max_lng, min_lat], [max_lng, max_lat], [min_lng, max_lat], [min_lng, min_lat]
+    ]]}}
+
+def _circle_filter(latitude: float, longitude: float, radius_m: float) -> dict:
+    """중심점 반경 radius_m → $geoWithin 조건"""
+    return {"$centerSphere": [[longitude, latitude], radius_m / EARTH_RADIUS_M]}
+
 # 모델 경로 설정 (절대경로)
 BASE_DIR = Path(__file__).resolve().parent
 MODEL_DIR = BASE_DIR / "model"
@@ -531,46 +629,180 @@ MODEL_DIR = BASE_DIR / "model"
 pest_model_path = MODEL_DIR / "Bug_Detect.pt"  # 해충 탐지 모델
 disease_model_path = MODEL_DIR / "Crop_Disease.pt"  # 병해 탐지 모델
 
-if not pest_model_path.exists():
-    raise RuntimeError(f"해충 탐지 모델이 존재하지 않습니다: {pest_model_path}")
-if not disease_model_path.exists():
-    raise RuntimeError(f"병해 탐지 모델이 존재하지 않습니다: {disease_model_path}")
+# 캐시에는 이 값 이상인 박스를 모두 저장하고, 요청별 임계값은 조회 시 필터링
+RAW_CONFIDENCE_FLOOR = float(os.getenv("RAW_CONFIDENCE_FLOOR", "0.01"))
+
+# 탐지 모델은 처음 쓸 때 로드 (MODEL_WARMUP=true 면 서버 시작 시)
+# MODEL_BACKEND=onnx 면 export 된 .onnx 를 ONNX Runtime 으로 실행
+model_registry.register("pest", model_path_for(pest_model_path), load_backend, "해충 탐지")
+model_registry.register("disease", model_path_for(disease_model_path), load_backend, "병해 탐지")
+
+def _batch_runner(model_name: str):
+    def run(images):
+        return model_registry.get(model_name).model.predict(images, RAW_CONFIDENCE_FLOOR)
+    return run
+
+# 요청들을 마이크로 배치로 묶어서 실행하는 모델별 스케줄러
+pest_scheduler = InferenceScheduler("pest", _batch_runner("pest"))
+disease_scheduler = InferenceScheduler("disease", _batch_runner("disease"))
+
+# sub_category → (모델 이름, 스케줄러)
+DETECTION_MODELS = {
+    "해충": ("pest", pest_scheduler),
+    "병해": ("disease", disease_scheduler),
+}
+DEFAULT_CONFIDENCE_THRESHOLD = 0.25
 
-# Ultralytics YOLO 모델 로드
-pest_model = YOLO(str(pest_model_path))
-disease_model = YOLO(str(disease_model_path))
+def get_inference_metrics():
+    return [pest_scheduler.metrics(), disease_scheduler.metrics()]
 
-pest_labels = pest_model.names
-disease_labels = disease_model.names
+def shutdown_inference():
+    pest_scheduler.shutdown()
+    disease_scheduler.shutdown()
+
+def purge_stale_detection_cache():
+    for model_name, _ in DETECTION_MODELS.values():
+        model_id = model_registry.identity(model_name)
+        if model_id:
+            detection_cache.purge_stale(model_name, model_id)
+
+def warm_up_models():
+    model_registry.warm_up()
 
 def preprocess_image(image_bytes):
+    from PIL import Image, ImageOps
+
     try:
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+        # 저장된 width/height 와 같은 좌표계가 되도록 EXIF 회전 적용
+        image = ImageOps.exif_transpose(Image.open(io.BytesIO(image_bytes))).convert("RGB")
         return image
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"이미지 처리 실패: {str(e)}")
 
-def process_yolo_results(results, labels, confidence_threshold=0.25):
-    detections = []
-    for box in results[0].boxes:
-        conf = float(box.conf[0])
-        if conf >= confidence_threshold:
-            class_id = int(box.cls[0])
-            xyxy = box.xyxy[0].tolist()
-            detections.append({
-                "class_id": class_id,
-                "class_name": labels[class_id],
-                "confidence": conf,
-                "bbox": {
-                    "x1": xyxy[0],
-                    "y1": xyxy[1],
-                    "x2": xyxy[2],
-                    "y2": xyxy[3]
-                }
-            })
-    return detections
-
-def detect_damage_from_report(report_id: str, confidence_threshold: float = 0.25):
+def process_yolo_results(detections, confidence_threshold=0.25):
+    """저장된(임계값 적용 전) 탐지 결과에서 confidence_threshold 이상만 남김"""
+    return [d for d in detections if d["confidence"] >= confidence_threshold]
+
+# 이미지 디코드/전처리용 스레드 풀 (PIL 디코드는 GIL 을 놓음)
+DECODE_WORKERS = int(os.getenv("DECODE_WORKERS", "4"))
+decode_pool = ThreadPoolExecutor(max_workers=DECODE_WORKERS, thread_name_prefix="decode")
+
+def _load_and_decode(file_info: dict):
+    """
+    탐지용 이미지 디코드 → (PIL 이미지, 원본 좌표로 되돌릴 배율)
+    - 업로드 시 만들어 둔 모델 입력 크기 변형본이 있으면 그걸 사용 (원본 재디코드/리사이즈 생략)
+    """
+    variant = (file_info.get("variants") or {}).get("model")
+    if variant and file_info.get("width"):
+        image = preprocess_image(get_blob_store().read(variant["sha256"]))
+        return image, file_info["width"] / variant["width"]
+    return preprocess_image(read_report_file(file_info)), 1.0
+
+def _scale_detections(detections: list, scale: float) -> list:
+    if scale == 1.0:
+        return detections
+    return [
+        {**d, "bbox": {k: v * scale for k, v in d["bbox"].items()}}
+        for d in detections
+    ]
+
+def detect_files(files: list, model_name: str, scheduler) -> list:
+    """
+    첨부파일 전체의 임계값 적용 전 탐지 결과 (파일 순서대로)
+    - 캐시에 있는 파일은 건너뜀
+    - 나머지는 디코드를 병렬로 하고, 한꺼번에 스케줄러에 넣어 같은 배치로 추론
+    - 파일별 실패는 {"error": ...} 로 반환
+    """
+    # 캐시 조회에는 파일 식별자만 필요하므로 모델은 캐시 미스가 있을 때 로드됨
+    model_id = model_registry.identity(model_name) or model_registry.get(model_name).model_id
+    results = [None] * len(files)
+    hashes = [None] * len(files)
+    pending = []  # (index, decode future)
+
+    for idx, file_info in enumerate(files):
+        image_hash = file_info.get("sha256")
+        if not image_hash:  # 마이그레이션 전 base64 문서
+            try:
+                image_hash = hashlib.sha256(read_report_file(file_info)).hexdigest()
+            except HTTPException as e:
+                results[idx] = {"error": e.detail}
+                continue
+        hashes[idx] = image_hash
+
+        cached = detection_cache.get(model_id, image_hash)
+        if cached is not None:
+            results[idx] = {"detections": cached}
+        else:
+            pending.append((idx, decode_pool.submit(_load_and_decode, file_info)))
+
+    images = []
+    for idx, future in pending:
+        try:
+            image, scale = future.result()
+            images.append((idx, image, scale))
+        except HTTPException as e:
+            results[idx] = {"error": e.detail}
+        except Exception as e:
+            results[idx] = {"error": f"이미지 디코드 실패: {str(e)}"}
+
+    if images:
+        outputs = scheduler.predict_many([image for _, image, _ in images])
+        for (idx, _, scale), detections in zip(images, outputs):
+            detections = _scale_detections(detections, scale)
+            detection_cache.put(model_name, model_id, hashes[idx], detections)
+            results[idx] = {"detections": detections}
+
+    return results
+
+def summarize_detections(file_results: list, top_n: int = 3) -> dict:
+    """신고 단위 요약: 클래스별 개수, 최고 신뢰도, 상위 클래스"""
+    class_counts = {}
+    class_max_conf = {}
+    for file_result in file_results:
+        for d in file_result.get("detections", []):
+            name = d["class_name"]
+            class_counts[name] = class_counts.get(name, 0) + 1
+            class_max_conf[name] = max(class_max_conf.get(name, 0.0), d["confidence"])
+
+    top_classes = sorted(
+        class_counts, key=lambda name: (class_counts[name], class_max_conf[name]), reverse=True
+    )[:top_n]
+    return {
+        "class_counts": class_counts,
+        "max_confidence": max(class_max_conf.values()) if class_max_conf else None,
+        "top_classes": [
+            {"class_name": name, "count": class_counts[name], "max_confidence": class_max_conf[name]}
+            for name in top_classes
+        ]
+    }
+
+def build_detection_result(category: str, raw_results: list, confidence_threshold: float) -> dict:
+    file_results = []
+    for idx, raw in enumerate(raw_results):
+        if "error" in raw:
+            file_results.append({"index": idx, "error": raw["error"],
+                                 "total_detections": 0, "detections": []})
+            continue
+        detections = process_yolo_results(raw["detections"], confidence_threshold)
+        file_results.append({"index": idx, "total_detections": len(detections),
+                             "detections": detections})
+
+    # 전체 탐지 결과 (신뢰도 내림차순, 어느 파일인지 표시)
+    all_detections = sorted(
+        ({**d, "file_index": f["index"]} for f in file_results for d in f["detections"]),
+        key=lambda d: d["confidence"], reverse=True
+    )
+    return {
+        "category": category,
+        "confidence_threshold": confidence_threshold,
+        "total_detections": len(all_detections),
+        "detections": all_detections,
+        "primary_detection": all_detections[0] if all_detections else None,
+        "files": file_results,
+        "summary": summarize_detections(file_results)
+    }
+
+def detect_damage_from_report(report_id: str, confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD):
     try:
         report = db.damage_report.find_one({"_id": ObjectId(report_id)})
     except Exception:
@@ -583,36 +815,74 @@ def detect_damage_from_report(report_id: str, confidence_threshold: float = 0.25
     if not files:
         raise HTTPException(status_code=400, detail="저장된 파일이 없습니다.")
 
-    file_info = files[0]
-    base64_data = file_info.get("base64_data")
-    if not base64_data:
-        raise HTTPException(status_code=400, detail="파일에 Base64 데이터가 없습니다.")
+    category = report["sub_category"]
+    if category not in DETECTION_MODELS:
+        raise HTTPException(status_code=400, detail="지원하지 않는 sub_category입니다 (해충, 병해만 가능)")
 
-    try:
-        image_bytes = base64.b64decode(base64_data)
-        image_pil = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"이미지 디코드 실패: {str(e)}")
-
-    # YOLO 탐지 수행
-    if report["sub_category"] == "해충":
-        results = pest_model(image_pil)
-        labels = pest_labels
-        category = "해충"
-    elif report["sub_category"] == "병해":
-        results = disease_model(image_pil)
-        labels = disease_labels
-        category = "병해"
-    else:
+    # YOLO 탐지 수행 (같은 이미지·모델이면 캐시 결과 재사용)
+    model_name, scheduler = DETECTION_MODELS[category]
+    raw_results = detect_files(files, model_name, scheduler)
+    if all("error" in raw for raw in raw_results):
+        raise HTTPException(status_code=400, detail=raw_results[0]["error"])
+
+    return build_detection_result(category, raw_results, confidence_threshold)
+
+def run_detection_job(job: dict) -> dict:
+    """신고에 첨부된 모든 파일을 탐지 (신고 문서 기록은 lease 확인 후 _record_detection_done 에서)"""
+    report_oid = ObjectId(job["report_id"])
+    report = db.damage_report.find_one({"_id": report_oid}, {"files": 1, "sub_category": 1})
+    if not report:
+        raise HTTPException(status_code=404, detail="신고 내역을 찾을 수 없습니다.")
+
+    category = report.get("sub_category")
+    if category not in DETECTION_MODELS:
         raise HTTPException(status_code=400, detail="지원하지 않는 sub_category입니다 (해충, 병해만 가능)")
 
-    detections = process_yolo_results(results, labels, confidence_threshold)
+    model_name, scheduler = DETECTION_MODELS[category]
+    raw_results = detect_files(report.get("files", []), model_name, scheduler)
+    if raw_results and all("error" in raw for raw in raw_results):
+        raise HTTPException(status_code=400, detail=raw_results[0]["error"])
+
+    return build_detection_result(category, raw_results, DEFAULT_CONFIDENCE_THRESHOLD)
+
+def _record_detection_done(job: dict, result: dict):
+    db.damage_report.update_one(
+        {"_id": ObjectId(job["report_id"])},
+        {"$set": {"detection": {
+            "status": "done",
+            "job_id": str(job["_id"]),
+            "updated_at": datetime.utcnow(),
+            **result
+        }}}
+    )
+
+def _mark_detection_failed(job: dict, error: str):
+    db.damage_report.update_one(
+        {"_id": ObjectId(job["report_id"])},
+        {"$set": {"detection": {
+            "status": "failed",
+            "job_id": str(job["_id"]),
+            "error": error,
+            "updated_at": datetime.utcnow()
+        }}}
+    )
+
+detection_jobs = JobQueue(
+    "detection", detection_jobs_collection, run_detection_job,
+    on_failed=_mark_detection_failed, on_done=_record_detection_done
+)
 
+def get_detection_job(job_id: str) -> dict:
+    job = detection_jobs.get(job_id)
     return {
-        "category": category,
-        "total_detections": len(detections),
-        "detections": detections,
-        "primary_detection": detections[0] if detections else None
+        "job_id": job["id"],
+        "report_id": job["report_id"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "error": job.get("error"),
+        "result": job.get("result"),
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"]
     }
 
 def convert_js_link(js_link: str) -> str:
@@ -633,6 +903,9 @@ def fetch_ongoing_projects():
     base_url = "https://www.rda.go.kr"
     list_url = f"{base_url}/young/custom.do"
 
+    import requests
+    from bs4 import BeautifulSoup
+
     resp = requests.get(list_url)
     resp.raise_for_status()
     soup = BeautifulSoup(resp.text, "html.parser")
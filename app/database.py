@@ -1,4 +1,7 @@
-from pymongo import MongoClient
+from collections import deque
+import threading
+
+from pymongo import MongoClient, ReadPreference, monitoring
 from dotenv import load_dotenv
 import os
 
@@ -16,7 +19,162 @@ if DB_NAME is None:
     raise ValueError("❌ DB_NAME 환경 변수가 설정되지 않았습니다. .env 파일을 확인하세요.")
 
 
-client = MongoClient(MONGODB_URI)
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+class DatabaseSettings:
+    """
+    MongoClient 연결 설정 (전부 환경 변수로 조정, 0 이면 제한 없음)
+    - 풀 크기 / 풀 대기 시간 / 서버 선택·연결·소켓 타임아웃
+    - 압축(zstd, snappy, zlib 중 설치된 것), 재시도 읽기/쓰기
+    - 목록 조회용 read preference (기본 secondaryPreferred)
+    """
+
+    def __init__(self, prefix: str = "MONGO_"):
+        self.max_pool_size = _env_int(f"{prefix}MAX_POOL_SIZE", 100)
+        self.min_pool_size = _env_int(f"{prefix}MIN_POOL_SIZE", 0)
+        self.max_connecting = _env_int(f"{prefix}MAX_CONNECTING", 2)
+        self.wait_queue_timeout_ms = _env_int(f"{prefix}WAIT_QUEUE_TIMEOUT_MS", 5000)
+        self.server_selection_timeout_ms = _env_int(f"{prefix}SERVER_SELECTION_TIMEOUT_MS", 5000)
+        self.connect_timeout_ms = _env_int(f"{prefix}CONNECT_TIMEOUT_MS", 5000)
+        self.socket_timeout_ms = _env_int(f"{prefix}SOCKET_TIMEOUT_MS", 30000)
+        self.compressors = os.getenv(f"{prefix}COMPRESSORS", "zstd,zlib")
+        self.retry_reads = os.getenv(f"{prefix}RETRY_READS", "true").lower() == "true"
+        self.retry_writes = os.getenv(f"{prefix}RETRY_WRITES", "true").lower() == "true"
+        self.list_read_preference = os.getenv(f"{prefix}LIST_READ_PREFERENCE", "secondaryPreferred")
+        # secondary 가 primary 보다 이만큼 이상 뒤처지면 읽지 않음 (최소 90초, 0 이면 제한 없음)
+        self.max_staleness_seconds = _env_int(f"{prefix}MAX_STALENESS_SECONDS", 0)
+
+    def client_kwargs(self) -> dict:
+        kwargs = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "maxConnecting": self.max_connecting,
+            "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+            "connectTimeoutMS": self.connect_timeout_ms,
+            "retryReads": self.retry_reads,
+            "retryWrites": self.retry_writes,
+        }
+        # 0 은 "제한 없음" → pymongo 에는 None 으로 전달
+        kwargs["waitQueueTimeoutMS"] = self.wait_queue_timeout_ms or None
+        kwargs["socketTimeoutMS"] = self.socket_timeout_ms or None
+        if self.compressors:
+            kwargs["compressors"] = self.compressors
+        return kwargs
+
+    def list_read_preference_obj(self):
+        """목록 조회 컬렉션에 쓸 read preference"""
+        mode = _READ_PREFERENCES.get(self.list_read_preference)
+        if mode is None:
+            raise ValueError(f"❌ 지원하지 않는 MONGO_LIST_READ_PREFERENCE 입니다: {self.list_read_preference}")
+        if mode is ReadPreference.PRIMARY:
+            return mode
+        return type(mode)(max_staleness=self.max_staleness_seconds or -1)
+
+
+_READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+
+class PoolWaitMetrics(monitoring.ConnectionPoolListener):
+    """커넥션 풀 checkout 대기 시간 수집 (최근 N건으로 백분위 계산)"""
+
+    def __init__(self, name: str, window: int = 2048):
+        self.name = name
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=window)
+        self.checkouts = 0
+        self.failures = {}
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.open_connections = 0
+        self.checked_out = 0
+        self.pools_cleared = 0
+
+    def _record_wait(self, seconds: float):
+        self._recent.append(seconds)
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self._record_wait(getattr(event, "duration", 0.0) or 0.0)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            reason = str(event.reason)
+            self.failures[reason] = self.failures.get(reason, 0) + 1
+            self._record_wait(getattr(event, "duration", 0.0) or 0.0)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pools_cleared += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = sorted(self._recent)
+            checkouts = self.checkouts
+            total_wait = self.total_wait
+
+            def pct(p: float):
+                if not recent:
+                    return 0.0
+                return round(recent[min(len(recent) - 1, int(len(recent) * p))] * 1000, 3)
+
+            return {
+                "checkouts": checkouts,
+                "failures": dict(self.failures),
+                "wait_ms": {
+                    "avg": round(total_wait / checkouts * 1000, 3) if checkouts else 0.0,
+                    "p50": pct(0.50),
+                    "p99": pct(0.99),
+                    "max": round(self.max_wait * 1000, 3),
+                },
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "pools_cleared": self.pools_cleared,
+            }
+
+
+settings = DatabaseSettings()
+sync_pool_metrics = PoolWaitMetrics("sync")
+
+client = MongoClient(MONGODB_URI, event_listeners=[sync_pool_metrics], **settings.client_kwargs())
 db = client[DB_NAME]
 
 print("✅ MongoDB에 성공적으로 연결되었습니다!")
@@ -28,3 +186,25 @@ comments_collection = db["comments"]
 post_likes_collection = db["post_likes"]
 damage_report_collection = db["damage_report"]
 
+# 목록 조회 전용 (secondary 허용, 쓰기 직후 결과는 잠깐 늦게 보일 수 있음)
+LIST_READ_PREFERENCE = settings.list_read_preference_obj()
+damage_report_list_collection = damage_report_collection.with_options(read_preference=LIST_READ_PREFERENCE)
+
+_tool_client = None
+
+
+def tool_database():
+    """
+    운영 도구(app/tools) 전용 DB 핸들
+    - 백필/재집계 aggregation 은 오래 걸리므로 MONGO_SOCKET_TIMEOUT_MS 를 적용하지 않음
+    - 서버 선택/연결 타임아웃 등 나머지 설정은 앱과 동일
+    """
+    global _tool_client
+    if _tool_client is None:
+        kwargs = settings.client_kwargs()
+        kwargs["socketTimeoutMS"] = None
+        kwargs["maxPoolSize"] = 10
+        kwargs["minPoolSize"] = 0
+        _tool_client = MongoClient(MONGODB_URI, **kwargs)
+    return _tool_client[DB_NAME]
+
@@ -0,0 +1,98 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+DETECTION_CACHE_SIZE = int(os.getenv("DETECTION_CACHE_SIZE", "1024"))
+
+detection_cache_collection = db["detection_cache"]
+
+
+def model_identity(model_path: Path) -> str:
+    """모델 파일이 바뀌면 달라지는 식별자 (파일명 + 크기 + 수정시각)"""
+    stat = Path(model_path).stat()
+    return f"{Path(model_path).name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class DetectionCache:
+    """
+    (이미지 해시, 모델 식별자) → 임계값 적용 전 탐지 결과
+    - 프로세스 내 LRU 를 먼저 보고, 없으면 Mongo(detection_cache) 조회
+    - 임계값은 조회 후 process_yolo_results 에서 필터링
+    """
+
+    def __init__(self, collection=detection_cache_collection, capacity: int = DETECTION_CACHE_SIZE):
+        self.collection = collection
+        self.capacity = capacity
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(model_id: str, image_sha256: str) -> str:
+        return f"{model_id}:{image_sha256}"
+
+    def _remember(self, key: str, detections: List[dict]):
+        with self._lock:
+            self._memory[key] = detections
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.capacity:
+                self._memory.popitem(last=False)
+
+    def get(self, model_id: str, image_sha256: str) -> Optional[List[dict]]:
+        key = self._key(model_id, image_sha256)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        doc = self.collection.find_one({"_id": key}, {"detections": 1})
+        if doc is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        self._remember(key, doc["detections"])
+        with self._lock:
+            self.hits += 1
+        return doc["detections"]
+
+    def put(self, model_name: str, model_id: str, image_sha256: str, detections: List[dict]):
+        key = self._key(model_id, image_sha256)
+        self._remember(key, detections)
+        self.collection.replace_one(
+            {"_id": key},
+            {
+                "model_name": model_name,
+                "model_id": model_id,
+                "image_sha256": image_sha256,
+                "detections": detections,
+                "created_at": datetime.utcnow(),
+            },
+            upsert=True,
+        )
+
+    def purge_stale(self, model_name: str, current_model_id: str) -> int:
+        """모델 파일이 바뀐 뒤 남아있는 이전 모델 결과 삭제 (메모리 LRU 는 키가 달라 자연히 밀려남)"""
+        result = self.collection.delete_many(
+            {"model_name": model_name, "model_id": {"$ne": current_model_id}}
+        )
+        if result.deleted_count:
+            logger.info("🧹 [%s] 이전 모델 탐지 캐시 %d건 삭제", model_name, result.deleted_count)
+        return result.deleted_count
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._memory), "capacity": self.capacity,
+                    "hits": self.hits, "misses": self.misses}
+
+
+detection_cache = DetectionCache()
@@ -0,0 +1,141 @@
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from app.blob_store import get_blob_store, oriented_size
+from app.model_backends import MODEL_IMGSZ
+
+logger = logging.getLogger(__name__)
+
+IMAGE_PIPELINE_WORKERS = int(os.getenv("IMAGE_PIPELINE_WORKERS", "2"))
+THUMBNAIL_SIZES = sorted(int(size) for size in os.getenv("THUMBNAIL_SIZES", "160,480").split(",") if size.strip())
+THUMBNAIL_QUALITY = int(os.getenv("THUMBNAIL_QUALITY", "80"))
+MODEL_VARIANT_QUALITY = 90
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _save(store, image, fmt: str, quality: int, keys: list) -> dict:
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, quality=quality)
+    key = store.put(buffer.getvalue())
+    keys.append(key)
+    return {"sha256": key, "width": image.width, "height": image.height}
+
+
+class ImagePipelineError(Exception):
+    """변환 중 실패 (그 전까지 저장한 blob 키를 함께 전달, 프로세스 간 pickle 가능)"""
+
+    def __init__(self, message: str, keys: list):
+        super().__init__(message, keys)
+        self.keys = keys
+
+
+def process_image(sha256: str) -> dict:
+    """
+    (워커 프로세스에서 실행) 원본을 한 번만 디코드해서
+    - EXIF 회전 적용
+    - 모델 입력 크기(MODEL_IMGSZ)로 줄인 JPEG
+    - THUMBNAIL_SIZES 별 WebP 썸네일
+    을 blob store 에 저장하고 참조를 반환
+    """
+    from PIL import Image, ImageOps
+
+    store = get_blob_store()
+    largest = max([MODEL_IMGSZ] + THUMBNAIL_SIZES)
+    keys = []  # 이번에 쓴 blob (새로 저장됐든 이미 있었든), 저장 직후 바로 기록
+    try:
+        with store.open(sha256) as f:
+            image = Image.open(f)
+            # draft() 는 디코드 크기를 줄이므로 원본 크기는 그 전에 헤더에서 읽음 (업로드 시와 같은 EXIF 회전 기준)
+            width, height = oriented_size(image)
+            # JPEG 는 DCT 단계에서 바로 축소 디코드 (4000px → 필요한 크기 근처)
+            image.draft("RGB", (largest, largest))
+            image = ImageOps.exif_transpose(image).convert("RGB")
+
+        model_image = image.copy()
+        model_image.thumbnail((MODEL_IMGSZ, MODEL_IMGSZ), Image.BILINEAR)
+
+        thumbnails = {}
+        for size in THUMBNAIL_SIZES:
+            thumb = image.copy()
+            thumb.thumbnail((size, size), Image.LANCZOS)
+            thumbnails[str(size)] = _save(store, thumb, "WEBP", THUMBNAIL_QUALITY, keys)
+        model = _save(store, model_image, "JPEG", MODEL_VARIANT_QUALITY, keys)
+    except Exception as e:
+        raise ImagePipelineError(f"{type(e).__name__}: {e}", keys) from None
+
+    return {
+        "width": width,
+        "height": height,
+        "model": model,
+        "thumbnails": thumbnails,
+        "keys": keys,
+    }
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # 서버 프로세스에 스레드가 많아서 fork 대신 spawn 사용
+        _pool = ProcessPoolExecutor(
+            max_workers=IMAGE_PIPELINE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+async def normalize_report_images(file_infos: List[dict], blob_keys: Optional[list] = None) -> List[dict]:
+    """
+    업로드된 파일들을 프로세스 풀에서 병렬 처리하고 variants 를 붙여서 반환
+    - 변형본 blob 은 참조 카운트를 올리고 blob_keys 에 모음 (신고 저장 실패 시 release)
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_pool()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(pool, process_image, f["sha256"]) for f in file_infos),
+        return_exceptions=True,
+    )
+
+    normalized = []
+    for file_info, result in zip(file_infos, results):
+        # 워커 프로세스가 DB 에 연결하지 않도록 참조 카운트는 여기서 (지연 import)
+        from app import blob_refs
+        if isinstance(result, Exception):
+            logger.warning("⚠️ 이미지 변환 실패 %s: %s", file_info.get("original_filename"), result)
+            # 실패 전에 저장된 변형본은 어디서도 참조하지 않음 → 정리 대상으로 등록
+            if getattr(result, "keys", None):
+                await asyncio.to_thread(blob_refs.track, result.keys)
+            normalized.append(file_info)
+            continue
+        await asyncio.to_thread(blob_refs.retain, result["keys"])
+        if blob_keys is not None:
+            blob_keys.extend(result["keys"])
+        normalized.append({
+            **file_info,
+            # EXIF 회전을 적용한 원본 크기 (탐지 박스 배율 기준)
+            "width": result["width"],
+            "height": result["height"],
+            "variants": {"model": result["model"], "thumbnails": result["thumbnails"]},
+        })
+    return normalized
+
+
+def thumbnail_urls(file_info: dict) -> dict:
+    thumbnails = (file_info.get("variants") or {}).get("thumbnails") or {}
+    return {size: f"/blobs/{t['sha256']}" for size, t in thumbnails.items()}
+
+
+def smallest_thumbnail_url(file_info: dict) -> Optional[str]:
+    urls = thumbnail_urls(file_info)
+    return urls[min(urls, key=int)] if urls else None
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
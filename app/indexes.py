@@ -0,0 +1,77 @@
+import logging
+
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# 컬렉션별 인덱스 선언 (crud.py 의 쿼리 형태 기준)
+INDEX_SPECS = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "post": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        IndexModel(
+            [("local_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="local_id_created_at_id",
+        ),
+    ],
+    "comments": [
+        IndexModel(
+            [("post_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="post_id_created_at_id",
+        ),
+    ],
+    "post_likes": [
+        IndexModel([("post_id", ASCENDING), ("user_id", ASCENDING)], name="post_id_user_id_unique", unique=True),
+        IndexModel(
+            [("post_id", ASCENDING), ("liked_at", DESCENDING), ("_id", DESCENDING)],
+            name="post_id_liked_at_id",
+        ),
+    ],
+    "damage_report": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_id_created_at"),
+        IndexModel(
+            [("location", GEOSPHERE), ("main_category", ASCENDING), ("sub_category", ASCENDING),
+             ("created_at", DESCENDING)],
+            name="location_2dsphere_category_created_at",
+        ),
+    ],
+    "report_tiles": [
+        IndexModel([("z", ASCENDING), ("_id", ASCENDING)], name="z_id"),
+    ],
+    "detection_jobs": [
+        IndexModel([("queue", ASCENDING), ("status", ASCENDING), ("run_after", ASCENDING)],
+                   name="queue_status_run_after"),
+        IndexModel([("queue", ASCENDING), ("status", ASCENDING), ("lease_until", ASCENDING)],
+                   name="queue_status_lease_until"),
+    ],
+    "blob_refs": [
+        IndexModel([("refs", ASCENDING), ("updated_at", ASCENDING)], name="refs_updated_at"),
+    ],
+    "detection_cache": [
+        IndexModel([("model_name", ASCENDING), ("model_id", ASCENDING)], name="model_name_model_id"),
+    ],
+}
+
+
+def ensure_indexes(db) -> dict:
+    """
+    선언된 인덱스를 생성 (이미 있으면 no-op)
+    - 기존 데이터가 unique 조건을 깨는 경우 서버 기동은 막지 않고 경고만 남김
+    """
+    created = {}
+    for collection_name, models in INDEX_SPECS.items():
+        collection = db[collection_name]
+        created[collection_name] = []
+        for model in models:
+            try:
+                created[collection_name].extend(collection.create_indexes([model]))
+            except OperationFailure as e:
+                logger.warning(
+                    "⚠️ 인덱스 생성 실패 %s.%s: %s",
+                    collection_name, model.document["name"], e
+                )
+    return created
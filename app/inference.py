@@ -0,0 +1,242 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수로 조정 가능한 기본값
+INFERENCE_BATCH_SIZE = int(os.getenv("INFERENCE_BATCH_SIZE", "8"))
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "20"))
+INFERENCE_QUEUE_DEPTH = int(os.getenv("INFERENCE_QUEUE_DEPTH", "64"))
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+INFERENCE_TIMEOUT_SECONDS = float(os.getenv("INFERENCE_TIMEOUT_SECONDS", "30"))
+# 수집 스레드가 종료 플래그를 확인하는 간격
+STOP_POLL_SECONDS = 0.5
+
+SHUTTING_DOWN = "탐지 서비스가 종료 중입니다."
+
+
+class InferenceScheduler:
+    """
+    탐지 요청을 모아서 마이크로 배치로 실행하는 프로세스 내 스케줄러
+    - 첫 요청이 들어온 뒤 max_wait_ms 동안(또는 max_batch_size 까지) 요청을 모음
+    - 배치는 전용 워커 풀에서 run_batch(items) 로 실행되고, 요청별 Future 로 결과 전달
+    - 워커가 모두 바쁘면 요청은 큐에 쌓여 다음 배치가 커짐
+    """
+
+    def __init__(self, name: str, run_batch: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = INFERENCE_BATCH_SIZE,
+                 max_wait_ms: float = INFERENCE_MAX_WAIT_MS,
+                 queue_depth: int = INFERENCE_QUEUE_DEPTH,
+                 workers: int = INFERENCE_WORKERS):
+        self.name = name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.queue_depth = queue_depth
+        self.workers = max(1, workers)
+        self._run_batch = run_batch
+
+        self._queue = queue.Queue(maxsize=queue_depth)
+        self._slots = threading.Semaphore(self.workers)
+        self._start_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._collector: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+        self._metrics_lock = threading.Lock()
+        self._batches = 0
+        self._images = 0
+        self._rejected = 0
+        self._failed_batches = 0
+        self._in_flight = 0
+        self._queue_wait_total = 0.0
+        self._batch_time_total = 0.0
+        self._max_batch_seen = 0
+
+    def _ensure_started(self):
+        if self._collector is not None:
+            return
+        with self._start_lock:
+            if self._collector is not None:
+                return
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix=f"inference-{self.name}"
+            )
+            self._collector = threading.Thread(
+                target=self._collect_loop, name=f"inference-{self.name}-collector", daemon=True
+            )
+            self._collector.start()
+
+    def submit(self, item) -> Future:
+        if self._stopped.is_set():
+            raise HTTPException(status_code=503, detail=SHUTTING_DOWN)
+        self._ensure_started()
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future, time.monotonic()))
+        except queue.Full:
+            with self._metrics_lock:
+                self._rejected += 1
+            raise HTTPException(status_code=503, detail="탐지 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+        if self._stopped.is_set():
+            self._fail_pending()  # shutdown 과 겹쳐 들어온 요청
+        return future
+
+    def predict(self, item, timeout: float = INFERENCE_TIMEOUT_SECONDS):
+        """submit 후 결과를 기다리는 동기 헬퍼"""
+        future = self.submit(item)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise HTTPException(status_code=504, detail="탐지 시간이 초과되었습니다.")
+
+    def predict_many(self, items: List[Any], timeout: float = INFERENCE_TIMEOUT_SECONDS) -> List[Any]:
+        """
+        여러 건을 넣어서 같은 배치로 묶이게 한 뒤 순서대로 결과 반환
+        - 큐 용량을 넘지 않도록 (워커 수 x 배치 크기) 단위로 나눠서 넣고 기다림
+        - 중간에 실패하면 이미 넣은 요청은 취소 (남은 배치 자리를 쓰지 않게)
+        """
+        chunk_size = max(1, min(self.queue_depth, self.max_batch_size * self.workers))
+        deadline = time.monotonic() + timeout
+        results = []
+        futures = []
+        try:
+            for start in range(0, len(items), chunk_size):
+                futures = []
+                for item in items[start:start + chunk_size]:
+                    futures.append(self.submit(item))
+                results.extend(f.result(timeout=max(0.0, deadline - time.monotonic())) for f in futures)
+        except TimeoutError:
+            raise HTTPException(status_code=504, detail="탐지 시간이 초과되었습니다.")
+        finally:
+            for f in futures:
+                f.cancel()
+        return results
+
+    def _collect_loop(self):
+        # 큐/세마포어 대기는 모두 타임아웃을 두고 종료 플래그를 확인 (종료 신호를 큐에 막혀서 못 넣는 일이 없게)
+        while not self._stopped.is_set():
+            # 워커 자리가 날 때까지 기다리는 동안 요청은 큐에 계속 쌓임
+            if not self._slots.acquire(timeout=STOP_POLL_SECONDS):
+                continue
+            try:
+                first = self._queue.get(timeout=STOP_POLL_SECONDS)
+            except queue.Empty:
+                first = None
+            if first is None or self._stopped.is_set():
+                if first is not None:
+                    self._fail(first[1])
+                self._slots.release()
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:  # shutdown 이 깨운 것
+                    break
+                batch.append(entry)
+
+            batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+            if not batch:
+                self._slots.release()
+                continue
+            with self._metrics_lock:
+                self._in_flight += 1
+            try:
+                self._executor.submit(self._run, batch)
+            except RuntimeError:  # shutdown 이 수집 스레드를 기다리다 먼저 풀을 닫은 경우
+                with self._metrics_lock:
+                    self._in_flight -= 1
+                for _, future, _ in batch:
+                    future.set_exception(HTTPException(status_code=503, detail=SHUTTING_DOWN))
+                self._slots.release()
+
+    def _run(self, batch):
+        started = time.monotonic()
+        try:
+            outputs = self._run_batch([item for item, _, _ in batch])
+            if len(outputs) != len(batch):
+                raise RuntimeError(f"배치 결과 개수 불일치: {len(outputs)} != {len(batch)}")
+            for (_, future, _), output in zip(batch, outputs):
+                future.set_result(output)
+            failed = False
+        except Exception as e:
+            logger.exception("❌ [%s] 배치 추론 실패", self.name)
+            for _, future, _ in batch:
+                future.set_exception(e)
+            failed = True
+        finally:
+            self._slots.release()
+
+        elapsed = time.monotonic() - started
+        with self._metrics_lock:
+            self._in_flight -= 1
+            self._batches += 1
+            self._images += len(batch)
+            self._failed_batches += int(failed)
+            self._batch_time_total += elapsed
+            self._queue_wait_total += sum(started - enqueued for _, _, enqueued in batch)
+            self._max_batch_seen = max(self._max_batch_seen, len(batch))
+
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            batches = self._batches or 1
+            images = self._images or 1
+            return {
+                "name": self.name,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "workers": self.workers,
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self.queue_depth,
+                "in_flight_batches": self._in_flight,
+                "batches": self._batches,
+                "images": self._images,
+                "failed_batches": self._failed_batches,
+                "rejected": self._rejected,
+                "avg_batch_size": self._images / batches,
+                "max_batch_size_seen": self._max_batch_seen,
+                "avg_batch_latency_ms": self._batch_time_total / batches * 1000,
+                "avg_queue_wait_ms": self._queue_wait_total / images * 1000,
+            }
+
+    @staticmethod
+    def _fail(future: Future):
+        if future.set_running_or_notify_cancel():
+            future.set_exception(HTTPException(status_code=503, detail=SHUTTING_DOWN))
+
+    def _fail_pending(self):
+        """큐에 남은 요청의 Future 를 모두 실패 처리 (기다리던 쪽이 타임아웃까지 붙잡혀 있지 않게)"""
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if entry is not None:
+                self._fail(entry[1])
+
+    def shutdown(self, wait: bool = True):
+        self._stopped.set()
+        if self._collector is not None:
+            try:
+                self._queue.put_nowait(None)  # 대기 중인 수집 스레드를 바로 깨움 (가득 차 있으면 어차피 안 막힘)
+            except queue.Full:
+                pass
+            self._collector.join(timeout=5)
+        self._fail_pending()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
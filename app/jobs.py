@@ -0,0 +1,255 @@
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))
+
+detection_jobs_collection = db["detection_jobs"]
+
+
+class JobQueue:
+    """
+    Mongo 컬렉션에 상태를 저장하는 프로세스 내 작업 큐
+    - 워커 스레드 concurrency 개가 queued 작업을 원자적으로 가져감(find_one_and_update)
+    - 실행 중 서버가 죽으면 lease 가 만료된 running 작업을 다시 가져가므로 재시작 후에도 이어서 처리
+    - 실패하면 지수 백오프로 max_attempts 까지 재시도
+    - 가져갈 때마다 새 lease_owner 를 부여하고, 완료/실패 기록은 lease 를 아직 가진 경우에만 반영
+    - 실행 중에는 lease_seconds / 3 마다 lease 를 연장 (오래 걸리는 작업이 중복 실행되지 않게)
+    - 결과를 다른 문서에 반영하는 일은 on_done / on_failed 에서 (lease 확인 후에만 호출)
+    """
+
+    def __init__(self, name: str, collection, handler: Callable[[dict], dict],
+                 concurrency: int = JOB_CONCURRENCY,
+                 max_attempts: int = JOB_MAX_ATTEMPTS,
+                 poll_seconds: float = JOB_POLL_SECONDS,
+                 lease_seconds: int = JOB_LEASE_SECONDS,
+                 retry_base_seconds: float = JOB_RETRY_BASE_SECONDS,
+                 on_failed: Optional[Callable[[dict, str], None]] = None,
+                 on_done: Optional[Callable[[dict, dict], None]] = None):
+        self.name = name
+        self.collection = collection
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.on_failed = on_failed
+        self.on_done = on_done
+
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._threads = []
+
+    def new_job(self, payload: dict, job_id: Optional[ObjectId] = None) -> dict:
+        now = datetime.utcnow()
+        return {
+            "_id": job_id or ObjectId(),
+            "queue": self.name,
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": self.max_attempts,
+            "run_after": now,
+            "created_at": now,
+            "updated_at": now,
+            **payload,
+        }
+
+    def enqueue(self, payload: dict, job_id: Optional[ObjectId] = None) -> str:
+        job = self.new_job(payload, job_id)
+        self.collection.insert_one(job)
+        self._wake.set()
+        return str(job["_id"])
+
+    def get(self, job_id: str) -> dict:
+        try:
+            job = self.collection.find_one({"_id": ObjectId(job_id), "queue": self.name})
+        except InvalidId:
+            raise HTTPException(status_code=400, detail="유효하지 않은 job_id 형식입니다.")
+        if not job:
+            raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+        job["id"] = str(job.pop("_id"))
+        return job
+
+    def _attempts_left(self, left: bool) -> dict:
+        expr = ["$attempts", {"$ifNull": ["$max_attempts", self.max_attempts]}]
+        return {"$expr": {"$lt" if left else "$gte": expr}}
+
+    def _fail_abandoned(self, now: datetime):
+        """lease 가 만료된 running 작업 중 시도 횟수를 다 쓴 것은 다시 실행하지 않고 failed 처리"""
+        error = "작업 lease 만료 (워커 중단)"
+        while True:
+            job = self.collection.find_one_and_update(
+                {"queue": self.name, "status": "running", "lease_until": {"$lt": now},
+                 **self._attempts_left(False)},
+                {"$set": {"status": "failed", "error": error, "finished_at": now, "updated_at": now},
+                 "$unset": {"lease_until": "", "lease_owner": ""}},
+            )
+            if job is None:
+                return
+            logger.warning("⚠️ [%s] 작업 %s lease 만료, 재시도 한도 초과로 실패 처리", self.name, job["_id"])
+            if self.on_failed:
+                self.on_failed(job, error)
+
+    def _claim(self) -> Optional[dict]:
+        now = datetime.utcnow()
+        self._fail_abandoned(now)
+        return self.collection.find_one_and_update(
+            {
+                "queue": self.name,
+                "$or": [
+                    {"status": "queued", "run_after": {"$lte": now}},
+                    # 죽은 워커가 잡고 있던 작업 (시도 횟수가 남은 것만)
+                    {"status": "running", "lease_until": {"$lt": now}, **self._attempts_left(True)},
+                ],
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "lease_until": now + timedelta(seconds=self.lease_seconds),
+                    "lease_owner": ObjectId(),
+                    "started_at": now,
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_after", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def _owned(self, job: dict) -> dict:
+        """lease 를 아직 이 워커가 가진 경우에만 매칭되는 filter (만료 후 다른 워커가 가져갔으면 무시)"""
+        return {"_id": job["_id"], "lease_owner": job["lease_owner"]}
+
+    def _lease_lost(self, job: dict):
+        logger.warning("⚠️ [%s] 작업 %s lease 를 잃어 결과를 기록하지 않음", self.name, job["_id"])
+
+    def _finish(self, job: dict, result: dict):
+        now = datetime.utcnow()
+        updated = self.collection.update_one(
+            self._owned(job),
+            {"$set": {"status": "done", "result": result, "error": None,
+                      "finished_at": now, "updated_at": now},
+             "$unset": {"lease_until": "", "lease_owner": ""}},
+        )
+        if not updated.matched_count:
+            self._lease_lost(job)
+        elif self.on_done:
+            try:
+                self.on_done(job, result)
+            except Exception:
+                logger.exception("❌ [%s] 작업 %s 완료 결과 반영 실패", self.name, job["_id"])
+
+    def _fail(self, job: dict, error: str):
+        now = datetime.utcnow()
+        if job["attempts"] >= job.get("max_attempts", self.max_attempts):
+            updated = self.collection.update_one(
+                self._owned(job),
+                {"$set": {"status": "failed", "error": error, "finished_at": now, "updated_at": now},
+                 "$unset": {"lease_until": "", "lease_owner": ""}},
+            )
+            if not updated.matched_count:
+                self._lease_lost(job)
+            elif self.on_failed:
+                self.on_failed(job, error)
+            return
+        delay = self.retry_base_seconds * (2 ** (job["attempts"] - 1))
+        updated = self.collection.update_one(
+            self._owned(job),
+            {"$set": {"status": "queued", "error": error, "updated_at": now,
+                      "run_after": now + timedelta(seconds=delay)},
+             "$unset": {"lease_until": "", "lease_owner": ""}},
+        )
+        if not updated.matched_count:
+            self._lease_lost(job)
+
+    def _renew_lease(self, job: dict, done: threading.Event):
+        """handler 가 끝날 때까지 lease 연장 (lease 를 잃으면 중단)"""
+        interval = max(1.0, self.lease_seconds / 3)
+        while not done.wait(interval):
+            try:
+                renewed = self.collection.update_one(
+                    {**self._owned(job), "status": "running"},
+                    {"$set": {"lease_until": datetime.utcnow() + timedelta(seconds=self.lease_seconds)}},
+                )
+            except Exception:
+                logger.warning("⚠️ [%s] 작업 %s lease 연장 실패, 다음 주기에 재시도",
+                               self.name, job["_id"], exc_info=True)
+                continue
+            if not renewed.matched_count:
+                self._lease_lost(job)
+                return
+
+    def _worker_loop(self):
+        while not self._stopped.is_set():
+            try:
+                job = self._claim()
+            except Exception:
+                logger.exception("❌ [%s] 작업 조회 실패", self.name)
+                self._stopped.wait(self.poll_seconds)
+                continue
+
+            if job is None:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+                continue
+
+            done = threading.Event()
+            heartbeat = threading.Thread(target=self._renew_lease, args=(job, done),
+                                         name=f"job-{self.name}-lease", daemon=True)
+            heartbeat.start()
+            try:
+                result = self.handler(job)
+            except Exception as e:
+                done.set()
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                logger.warning("⚠️ [%s] 작업 실패 %s (시도 %d): %s",
+                               self.name, job["_id"], job["attempts"], detail)
+                self._fail(job, str(detail))
+            else:
+                done.set()
+                self._finish(job, result)
+            finally:
+                done.set()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stopped.clear()
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5):
+        self._stopped.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def metrics(self) -> dict:
+        counts = {
+            row["_id"]: row["count"]
+            for row in self.collection.aggregate([
+                {"$match": {"queue": self.name, "status": {"$in": ["queued", "running"]}}},
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            ])
+        }
+        return {"name": self.name, "concurrency": self.concurrency,
+                "queued": counts.get("queued", 0), "running": counts.get("running", 0)}
@@ -1,6 +1,6 @@
 from fastapi import (
     FastAPI, HTTPException, Header, Depends, APIRouter,
-    UploadFile, File, Form, Query
+    UploadFile, File, Form, Query, Path as PathParam, Request
 )
 from fastapi.security import HTTPBearer
 from fastapi.openapi.utils import get_openapi
@@ -10,6 +10,7 @@ from fastapi.responses import FileResponse
 from typing import Optional, List
 from datetime import datetime
 import os
+import asyncio
 
 import uuid
 from pathlib import Path
@@ -21,21 +22,28 @@ from app.schemas import (
     PostCreate, PostUpdate, CommentCreate
 )
 from app.crud import (
-    create_user, authenticate_user, get_user_mypage, update_user_mypage,
-    change_user_password, create_post,
-    get_all_posts_with_index, get_post_detail, update_post, delete_post,
-    add_comment, toggle_like_post, get_posts_by_local, create_damage_report,
-    get_like_status, get_comments_by_post, get_user_damage_reports,
-    get_damage_report_detail, get_recent_reports, update_comment, delete_comment,
-    cancel_like_count, validate_file, get_current_user, detect_damage_from_report,
-    fetch_ongoing_projects, save_uploaded_file_base64
+    create_damage_report,
+    get_damage_report_detail, get_damage_report_file, get_recent_reports,
+    validate_file, get_current_user, detect_damage_from_report,
+    fetch_ongoing_projects, save_uploaded_file
 )
 
-from . import crud, schemas
-from app.auth import create_access_token, get_current_user
+from . import async_crud, crud, schemas
+from app.async_database import async_pool_metrics, close_async_client
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.auth import create_access_token, get_current_user, get_optional_user
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from app.database import users_collection, post_collection
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from app.database import db, users_collection, post_collection, sync_pool_metrics
+from app.database import settings as db_settings
+from app.indexes import ensure_indexes
+from app.blob_store import blob_response
+from app.image_pipeline import normalize_report_images, shutdown_pool as shutdown_image_pipeline
+from app.tiles import TILE_CACHE_TTL_SECONDS, get_tile_clusters
+from app.report_feed import report_feed, sse_stream
+from app.recent_reports import recent_reports
+from app.passwords import shutdown as shutdown_password_pool
 from bson import ObjectId
 from fastapi.staticfiles import StaticFiles
 
@@ -80,14 +88,118 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
+# 업로드 요청 크기 제한
+# - Content-Length 가 있으면 본문을 읽기 전에 거절
+# - chunked 등 Content-Length 가 없거나 틀린 요청은 receive 단계에서 누적 바이트로 끊음
+#   (Starlette 가 multipart 를 임시 파일로 받아 두기 전에 중단)
+UPLOAD_PATHS = ("/damage-report",)
+MULTIPART_OVERHEAD = 1024 * 1024
+UPLOAD_TOO_LARGE = "업로드 용량이 너무 큽니다."
+
+class UploadSizeLimitMiddleware:
+    def __init__(self, app, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in UPLOAD_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length", b"").decode("latin-1")
+        if content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse(status_code=413, content={"detail": UPLOAD_TOO_LARGE})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise HTTPException(status_code=413, detail=UPLOAD_TOO_LARGE)
+            return message
+
+        async def tracked_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except HTTPException as e:
+            if e.status_code != 413 or response_started:
+                raise
+            response = JSONResponse(status_code=413, content={"detail": e.detail})
+            await response(scope, receive, send)
+
+app.add_middleware(UploadSizeLimitMiddleware, max_body_size=crud.MAX_REQUEST_SIZE + MULTIPART_OVERHEAD)
+
+# 서버 시작 시 인덱스 생성
+@app.on_event("startup")
+def create_indexes():
+    ensure_indexes(db)
+
+# 모델 파일이 바뀌었으면 이전 탐지 캐시 정리
+@app.on_event("startup")
+def purge_detection_cache():
+    crud.purge_stale_detection_cache()
+
+# 탐지 모델 미리 로드 (MODEL_WARMUP=true 인 경우, 기본은 처음 탐지할 때 로드)
+@app.on_event("startup")
+def warm_up_models():
+    if os.getenv("MODEL_WARMUP", "false").lower() == "true":
+        crud.warm_up_models()
+
+# 최근 신고 링 버퍼 적재
+@app.on_event("startup")
+def warm_recent_reports():
+    try:
+        crud.warm_recent_reports()
+    except Exception:
+        logger.exception("⚠️ 최근 신고 버퍼 적재 실패, 요청 시 DB 조회")
+
+# 실시간 신고 피드 시작 (REPORT_FEED_SOURCE=changestream 이면 change stream 구독)
+@app.on_event("startup")
+async def start_report_feed():
+    report_feed.start(asyncio.get_running_loop(), db.damage_report)
+
+# 자동 탐지 작업 워커 시작
+@app.on_event("startup")
+def start_detection_jobs():
+    crud.detection_jobs.start()
+
+# 서버 종료 시 탐지 워커 정리
+@app.on_event("shutdown")
+def stop_inference():
+    report_feed.stop()
+    recent_reports.stop()
+    crud.detection_jobs.stop()
+    crud.shutdown_inference()
+    shutdown_image_pipeline()
+    shutdown_password_pool()
+
+# 서버 종료 시 async MongoDB 클라이언트 정리
+@app.on_event("shutdown")
+async def close_async_database():
+    await close_async_client()
+
 # 회원가입
 @app.post('/register') 
-def register(user : UserRegister) :
+async def register(user : UserRegister) :
     try :
-        create_user(user)
+        await async_crud.create_user(user)
         return {'message':'✅ 회원가입 성공'}
     except ValueError as e :
         raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e :
         import traceback
         traceback.print_exc()  # ⬅️ 콘솔에 에러 출력
@@ -95,12 +207,17 @@ def register(user : UserRegister) :
     
 # 로그인
 @app.post("/login")
-def login(user: UserLogin):
-    authenticated = authenticate_user(user)
+async def login(user: UserLogin):
+    authenticated = await async_crud.authenticate_user(user)
     if not authenticated:
         raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 틀렸습니다.")
 
-    token = create_access_token({"user_id": str(authenticated["_id"])})
+    token = create_access_token({
+        "user_id": str(authenticated["_id"]),
+        "username": authenticated["username"],
+        "local_id": authenticated["local_id"],
+        "email": authenticated["email"]
+    })
     return {
         "message": f"{authenticated['username']} 님, 환영합니다!",
         "access_token": token
@@ -108,29 +225,29 @@ def login(user: UserLogin):
 
 # 비밀번호 변경
 @app.patch("/change-password")
-def change_password(
+async def change_password(
     req: ChangePasswordRequest,
     current_user: dict = Depends(get_current_user)
 ) :
     user_id = str(current_user["_id"])
-    change_user_password(user_id, req.current_password, req.new_password)
+    await async_crud.change_user_password(user_id, req.current_password, req.new_password)
     return {"message" : "✅ 비밀번호가 성공적으로 변경되었습니다"}
 
 # 마이페이지 조회
 @app.get("/mypage")
-def mypage(current_user: dict = Depends(get_current_user)):
+async def mypage(current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])  # ✅ ObjectId → str
-    user_info = get_user_mypage(user_id)
+    user_info = await async_crud.get_user_mypage(user_id)
     if not user_info:
         raise HTTPException(status_code=404, detail="❌ 사용자 정보를 찾을 수 없습니다.")
     return {"mypage": user_info} 
 
 # 마이페이지 수정
 @app.patch("/mypage")
-def update_mypage(update_req: MyPageUpdateRequest, current_user: dict = Depends(get_current_user)):
+async def update_mypage(update_req: MyPageUpdateRequest, current_user: dict = Depends(get_current_user)):
     try:
         user_id = str(current_user["_id"])
-        update_user_mypage(user_id, update_req.dict())
+        await async_crud.update_user_mypage(user_id, update_req.dict())
         return {"message": "✅ 마이페이지가 성공적으로 수정되었습니다."}
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
@@ -140,7 +257,7 @@ def update_mypage(update_req: MyPageUpdateRequest, current_user: dict = Depends(
 
 # 현재 사용자 정보 조회
 @app.get("/users/me")
-def get_current_user_info(current_user: dict = Depends(get_current_user)):
+async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     user_info = {
         "id": str(current_user["_id"]),
         "username": current_user["username"],
@@ -161,131 +278,147 @@ def get_current_user_info(current_user: dict = Depends(get_current_user)):
 
 # 게시글 작성
 @app.post("/post")
-def write_post(
+async def write_post(
     post_data: PostCreate,
     current_user: dict = Depends(get_current_user)
 ):
-    post = create_post(current_user, post_data.dict())
+    post = await async_crud.create_post(current_user, post_data.dict())
     post["id"] = str(post["_id"])
     del post["_id"]
     return post
 
 # 전체 글 목록 조회
 @app.get("/posts")
-def list_posts():
-    posts = get_all_posts_with_index()
-    return {"posts": posts}
+async def list_posts(
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Optional[dict] = Depends(get_optional_user)
+):
+    # 로그인한 경우 각 글에 liked_by_me 포함
+    user_id = str(current_user["_id"]) if current_user else None
+    return await async_crud.get_all_posts_with_index(cursor, limit, user_id)
+
+# 여러 게시글 좋아요 상태 한 번에 조회 (목록 화면용)
+@app.post("/posts/like-status/me")
+async def get_my_like_statuses(
+    request: schemas.LikeStatusBatchRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    return await async_crud.get_like_statuses(request.post_ids, str(current_user["_id"]))
 
 # 글 상세 조회
 @app.get("/posts/{post_id}")
-def post_detail(post_id: str):
-     return get_post_detail(post_id)
+async def post_detail(post_id: str):
+    return await async_crud.get_post_detail(post_id)
 
 # 게시글 수정
 @app.patch("/posts/{post_id}")
-def edit_post(
+async def edit_post(
     post_id: str,
     update: PostUpdate,
     current_user: dict = Depends(get_current_user)
 ):
-    update_post(post_id, str(current_user["_id"]), update.dict())
+    await async_crud.update_post(post_id, str(current_user["_id"]), update.dict())
     return {"message": "✅ 게시글이 수정되었습니다."}
 
 # 게시글 삭제
 @app.delete("/posts/{post_id}")
-def remove_post(
+async def remove_post(
     post_id: str,
     current_user: dict = Depends(get_current_user)
 ):
-    delete_post(post_id, str(current_user["_id"]))
+    await async_crud.delete_post(post_id, str(current_user["_id"]))
     return {"message": "✅ 게시글이 삭제되었습니다."}
 
 # 댓글 쓰기
 @app.post("/comments")
-def write_comment(
+async def write_comment(
     comment_data: CommentCreate,
     current_user: dict = Depends(get_current_user)
 ):
-    comment = add_comment(current_user, comment_data.dict())
+    comment = await async_crud.add_comment(current_user, comment_data.dict())
     comment["id"] = str(comment["_id"])
     del comment["_id"]
     return comment
 
 # 댓글 수정
 @app.patch("/comments/{comment_id}")
-def edit_comment(
+async def edit_comment(
     comment_id: str,
     comment_update: CommentUpdate,
     current_user: dict = Depends(get_current_user)
 ):
-    update_comment(comment_id, str(current_user["_id"]), comment_update.content)
+    await async_crud.update_comment(comment_id, str(current_user["_id"]), comment_update.content)
     return {"message": "✅ 댓글이 수정되었습니다."}
 
 # 댓글 삭제
 @app.delete("/comments/{comments_id}")
-def remove_comment(
+async def remove_comment(
     comments_id: str,
     current_user: dict = Depends(get_current_user)
 ):
-    delete_comment(comments_id, str(current_user["_id"]))
+    await async_crud.delete_comment(comments_id, str(current_user["_id"]))
     return {"message": "✅ 댓글이 삭제되었습니다."}
 
 # 댓글 조회
 @app.get("/posts/{post_id}/comments")
-def get_post_comments(post_id: str):
+async def get_post_comments(
+    post_id: str,
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
     """특정 게시글의 댓글 목록 조회"""
-    comments = get_comments_by_post(post_id)
-    return {
-        "post_id": post_id,
-        "comments": comments,
-        "total": len(comments)
-    }
+    return await async_crud.get_comments_by_post(post_id, cursor, limit)
 
 
 # 좋아요 기능
 @app.post("/posts/{post_id}/like")
-def like_post(
+async def like_post(
     post_id: str,
     current_user: dict = Depends(get_current_user)
 ):
-    result = toggle_like_post(post_id, str(current_user["_id"]))
-    return {"message": "좋아요 처리 완료", "liked": result["liked"]}
+    result = await async_crud.toggle_like_post(post_id, str(current_user["_id"]))
+    return {"message": "좋아요 처리 완료", **result}
+
+# 좋아요 (멱등: 이미 눌렀으면 changed=false)
+@app.put("/posts/{post_id}/like")
+async def put_post_like(
+    post_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    return await async_crud.add_like(post_id, str(current_user["_id"]))
 
 # 좋아요 상태
 @app.get("/posts/{post_id}/like-status")
-def get_post_like_status_public(post_id: str):
+async def get_post_like_status_public(post_id: str):
     """게시글 좋아요 상태 조회 (로그인 불필요)"""
-    try:
-        # 게시글 존재 확인
-        post = post_collection.find_one({"_id": ObjectId(post_id)})
-        if not post:
-            raise HTTPException(status_code=404, detail="⚠️ 게시글을 찾을 수 없습니다.")
-        
-        total_likes = post.get("likes", 0)
-        
-        return {
-            "post_id": post_id,
-            "total_likes": total_likes,
-            "user_liked": None  # 로그인하지 않은 경우
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=400, detail="잘못된 게시글 ID입니다.")
+    return await async_crud.get_like_total(post_id)
     
-# 좋아요 취소
+# 좋아요 취소 (멱등: 누르지 않았으면 changed=false)
 @app.delete("/posts/{post_id}/like")
-def cancel_post_like(post_id: str):
-    return cancel_like_count(post_id)
+async def cancel_post_like(
+    post_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    return await async_crud.remove_like(post_id, str(current_user["_id"]))
+
+# 좋아요 누른 사용자 목록
+@app.get("/posts/{post_id}/likes")
+async def list_post_likes(
+    post_id: str,
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    return await async_crud.get_post_likes_list(post_id, cursor, limit)
 
 # 로그인한 사용자의 좋아요 상태 조회
 @app.get("/posts/{post_id}/like-status/me")
-def get_my_like_status(
+async def get_my_like_status(
     post_id: str,
     current_user: dict = Depends(get_current_user)
 ):
     user_id = str(current_user["_id"])
-    like_status = get_like_status(post_id, user_id)
+    like_status = await async_crud.get_like_status(post_id, user_id)
     
     return {
         "post_id": post_id,
@@ -296,10 +429,13 @@ def get_my_like_status(
 
 # 로컬 아이디 필터링
 @app.get("/post/local")
-def list_local_posts(current_user: dict = Depends(get_current_user)):
+async def list_local_posts(
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: dict = Depends(get_current_user)
+):
     local_id = current_user["local_id"]
-    posts = get_posts_by_local(local_id)
-    return {"posts": posts}
+    return await async_crud.get_posts_by_local(local_id, cursor, limit)
 
 
 
@@ -321,14 +457,22 @@ async def report_damage_fixed(
     files: List[UploadFile] = File([]),
     current_user: dict = Depends(get_current_user)
 ):
+    blob_keys = []  # 이번 요청이 참조를 잡은 blob (신고 저장 실패 시 release)
     try:
         uploaded_file_infos = []
+        remaining = crud.MAX_REQUEST_SIZE  # 신고 1건 전체 업로드 한도
         for file in files:
             if file.filename:
-                uploaded = await save_uploaded_file_base64(file)
+                uploaded = await save_uploaded_file(file, max_total=remaining, blob_keys=blob_keys)
+                remaining -= uploaded["size"]
                 uploaded_file_infos.append(uploaded)
 
-        report_id = create_damage_report(
+        # EXIF 회전 / 모델 입력 크기 변형본 / 썸네일 생성 (프로세스 풀)
+        uploaded_file_infos = await normalize_report_images(uploaded_file_infos, blob_keys)
+
+        # 신고 저장 / 타일 집계 / 작업 예약은 sync PyMongo → 스레드풀에서 실행
+        created = await run_in_threadpool(
+            create_damage_report,
             user=current_user,
             main_category=main_category,
             sub_category=sub_category,
@@ -341,27 +485,89 @@ async def report_damage_fixed(
         )
         return {
             "message": "✅ 신고가 접수되었습니다.",
-            "report_id": report_id,
+            "report_id": created["report_id"],
+            "detection_job_id": created["detection_job_id"],
             "uploaded_files": len(uploaded_file_infos)
         }
+    # create_damage_report 는 insert 이후 예외를 내지 않으므로 여기 오면 신고는 저장되지 않은 것
+    except HTTPException:
+        await run_in_threadpool(crud.release_blobs, blob_keys)
+        raise
     except Exception as e:
+        await run_in_threadpool(crud.release_blobs, blob_keys)
         raise HTTPException(status_code=500, detail=f"신고 처리 실패: {str(e)}")
 
 
 # 사용자의 신고 목록 조회
 @app.get("/my-reports")
-def get_my_reports(current_user: dict = Depends(get_current_user)):
-    print("현재 사용자 ID:", current_user["_id"])  # 콘솔 확인용
+async def get_my_reports(current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])
-    reports = get_user_damage_reports(user_id)
+    reports = await async_crud.get_user_damage_reports(user_id)
     return {"reports": reports}
 
 # 신고 상세 조회
 @app.get("/report/{report_id}")
-def read_report_detail(report_id: str):
-    return get_damage_report_detail(report_id)
-
+def read_report_detail(
+    report_id: str,
+    include_payload: bool = Query(False, description="true 이면 파일 원본 데이터까지 포함")
+):
+    return get_damage_report_detail(report_id, include_payload)
 
+# 신고 첨부파일 (필요할 때만 개별 다운로드)
+@app.get("/report/{report_id}/files/{file_index}")
+def download_report_file(
+    report_id: str,
+    file_index: int = PathParam(..., ge=0),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+):
+    file_info = get_damage_report_file(report_id, file_index)
+    if file_info.get("sha256"):
+        return blob_response(file_info["sha256"], range_header, if_none_match,
+                             media_type=file_info.get("content_type"))
+    # 마이그레이션 전 문서 (base64 인라인)
+    return Response(content=crud.read_report_file(file_info),
+                    media_type=file_info.get("content_type") or "application/octet-stream")
+
+
+
+# 신고 이미지 (콘텐츠 주소 기반 스트리밍)
+@app.get("/blobs/{sha256}")
+def read_blob(
+    sha256: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+):
+    return blob_response(sha256, range_header, if_none_match)
+
+# 실시간 신고 구독 (Server-Sent Events)
+@app.get("/reports/stream")
+async def stream_reports(
+    request: Request,
+    main_category: Optional[str] = None,
+    sub_category: Optional[str] = None,
+    local: Optional[str] = None,
+    min_lng: Optional[float] = Query(None, ge=-180, le=180),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lng: Optional[float] = Query(None, ge=-180, le=180),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90)
+):
+    bbox_params = (min_lng, min_lat, max_lng, max_lat)
+    if any(v is not None for v in bbox_params) and not all(v is not None for v in bbox_params):
+        raise HTTPException(status_code=400, detail="⚠️ 영역 필터는 min/max 위경도를 모두 지정해야 합니다.")
+
+    report_feed.check_capacity()
+    filters = {
+        "main_category": main_category,
+        "sub_category": sub_category,
+        "local": local,
+        "bbox": bbox_params if min_lng is not None else None
+    }
+    return StreamingResponse(
+        sse_stream(request, filters),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 # 실시간 신고사항 확인
 @app.get("/reports/recent")
@@ -369,6 +575,51 @@ def read_recent_reports(limit: int = 20):
     reports = get_recent_reports(limit)
     return {"reports": reports}
 
+# 지도 화면 영역 내 신고 조회
+@app.get("/reports/bbox")
+async def read_reports_in_bbox(
+    min_lng: float = Query(..., ge=-180, le=180),
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lng: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    main_category: Optional[str] = None,
+    sub_category: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    return await async_crud.get_reports_in_bbox(min_lng, min_lat, max_lng, max_lat, main_category,
+                                                sub_category, since, until, cursor, limit)
+
+# 반경 내 신고 조회
+@app.get("/reports/nearby")
+async def read_reports_nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_m: float = Query(1000, gt=0, le=crud.MAX_RADIUS_M),
+    main_category: Optional[str] = None,
+    sub_category: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    return await async_crud.get_reports_nearby(lat, lng, radius_m, main_category, sub_category,
+                                               since, until, cursor, limit)
+
+# 지도 타일별 신고 클러스터 (줌 레벨별 집계)
+@app.get("/reports/tiles/{z}/{x}/{y}")
+def read_report_tile(
+    z: int, x: int, y: int,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+):
+    tile = get_tile_clusters(z, x, y)
+    headers = {"ETag": tile["etag"], "Cache-Control": f"public, max-age={int(TILE_CACHE_TTL_SECONDS)}"}
+    if if_none_match == tile["etag"]:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=tile["body"], headers=headers)
+
 # 병해충감지 
 @app.get("/damage-report/detect-damage/{report_id}")
 def detect_damage_api(
@@ -383,6 +634,31 @@ def detect_damage_api(
     result = detect_damage_from_report(report_id, confidence_threshold)
     return result
 
+# 자동 탐지 작업 상태 조회
+@app.get("/damage-report/jobs/{job_id}")
+def detection_job_status(job_id: str):
+    return crud.get_detection_job(job_id)
+
+# MongoDB 커넥션 풀 상태 (checkout 대기 시간 등)
+@app.get("/db/metrics")
+def database_metrics():
+    return {
+        "settings": vars(db_settings),
+        "pools": {
+            "sync": sync_pool_metrics.snapshot(),
+            "async": async_pool_metrics.snapshot()
+        }
+    }
+
+# 탐지 스케줄러 큐 상태
+@app.get("/inference/metrics")
+def inference_metrics():
+    return {
+        "models": crud.model_registry.status(),
+        "schedulers": crud.get_inference_metrics(),
+        "jobs": crud.detection_jobs.metrics()
+    }
+
 # 세미나
 @app.get("/rda/ongoing-projects", response_model=list[schemas.Project])
 def get_ongoing_projects():
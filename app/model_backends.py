@@ -0,0 +1,205 @@
+import ast
+import logging
+import os
+from pathlib import Path
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = Path(__file__).resolve().parent / "model"
+
+# torch | onnx
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "torch").lower()
+MODEL_IMGSZ = int(os.getenv("MODEL_IMGSZ", "640"))
+MODEL_IOU_THRESHOLD = float(os.getenv("MODEL_IOU_THRESHOLD", "0.7"))
+MODEL_MAX_DET = int(os.getenv("MODEL_MAX_DET", "300"))
+
+# ONNX Runtime 설정 (0 이면 onnxruntime 기본값)
+ONNX_INT8 = os.getenv("ONNX_INT8", "false").lower() == "true"
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+ONNX_INTER_OP_THREADS = int(os.getenv("ONNX_INTER_OP_THREADS", "1"))
+# 예: "OpenVINOExecutionProvider,CPUExecutionProvider" (onnxruntime-openvino 설치 시)
+ONNX_PROVIDERS = [p.strip() for p in os.getenv("ONNX_PROVIDERS", "CPUExecutionProvider").split(",") if p.strip()]
+
+LETTERBOX_COLOR = (114, 114, 114)
+MAX_WH = 7680  # 클래스별 NMS 를 한 번에 하기 위한 박스 오프셋
+
+
+def _detection(class_id: int, labels: dict, conf: float, xyxy) -> dict:
+    return {
+        "class_id": class_id,
+        "class_name": labels[class_id],
+        "confidence": conf,
+        "bbox": {
+            "x1": float(xyxy[0]),
+            "y1": float(xyxy[1]),
+            "x2": float(xyxy[2]),
+            "y2": float(xyxy[3])
+        }
+    }
+
+
+def extract_detections(result, labels) -> List[dict]:
+    """YOLO 결과 1건 → 임계값 적용 전 탐지 리스트 (신뢰도 내림차순)"""
+    detections = [
+        _detection(int(box.cls[0]), labels, float(box.conf[0]), box.xyxy[0].tolist())
+        for box in result.boxes
+    ]
+    detections.sort(key=lambda d: d["confidence"], reverse=True)
+    return detections
+
+
+def onnx_path_for(pt_path: Path, int8: bool = ONNX_INT8) -> Path:
+    pt_path = Path(pt_path)
+    return pt_path.with_suffix(".int8.onnx" if int8 else ".onnx")
+
+
+def model_path_for(pt_path: Path, backend: str = MODEL_BACKEND) -> Path:
+    """MODEL_BACKEND 에 맞는 모델 파일 경로 (.pt 또는 export 된 .onnx)"""
+    if backend == "onnx":
+        return onnx_path_for(pt_path)
+    if backend != "torch":
+        raise RuntimeError(f"지원하지 않는 MODEL_BACKEND 입니다: {backend}")
+    return Path(pt_path)
+
+
+class TorchBackend:
+    """Ultralytics(PyTorch) 백엔드"""
+
+    kind = "torch"
+
+    def __init__(self, path: Path):
+        # ultralytics/torch 는 무거워서 실제로 모델을 쓸 때 import
+        from ultralytics import YOLO
+
+        self.path = Path(path)
+        self.model = YOLO(str(path))
+        self.names = self.model.names
+
+    def predict(self, images: list, conf: float) -> List[List[dict]]:
+        results = self.model(images, verbose=False, conf=conf, iou=MODEL_IOU_THRESHOLD,
+                             max_det=MODEL_MAX_DET)
+        return [extract_detections(r, self.names) for r in results]
+
+
+class OnnxBackend:
+    """
+    ONNX Runtime 백엔드 (Ultralytics 로 export 한 YOLOv8 detect 모델)
+    - 입력: letterbox 된 (B, 3, imgsz, imgsz) float32
+    - 출력: (B, 4 + 클래스 수, 후보 수) → 신뢰도 필터 + 클래스별 NMS 후 원본 좌표로 복원
+    """
+
+    kind = "onnx"
+
+    def __init__(self, path: Path):
+        import onnxruntime as ort
+
+        self.path = Path(path)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if ONNX_INTRA_OP_THREADS:
+            options.intra_op_num_threads = ONNX_INTRA_OP_THREADS
+        if ONNX_INTER_OP_THREADS:
+            options.inter_op_num_threads = ONNX_INTER_OP_THREADS
+        available = set(ort.get_available_providers())
+        providers = [p for p in ONNX_PROVIDERS if p in available] or ["CPUExecutionProvider"]
+        self.session = ort.InferenceSession(str(path), sess_options=options, providers=providers)
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # 배치 차원이 고정(1)이면 한 장씩 실행
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+        height = model_input.shape[2]
+        self.imgsz = height if isinstance(height, int) else MODEL_IMGSZ
+
+        # Ultralytics export 는 클래스 이름을 메타데이터에 문자열로 넣어둠
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.names = ast.literal_eval(metadata["names"]) if "names" in metadata else {}
+        logger.info("✅ ONNX 세션 생성 %s (providers=%s, imgsz=%d)", self.path.name,
+                    self.session.get_providers(), self.imgsz)
+
+    def _letterbox(self, image):
+        import numpy as np
+        from PIL import Image
+
+        width, height = image.size
+        ratio = min(self.imgsz / height, self.imgsz / width)
+        new_w, new_h = round(width * ratio), round(height * ratio)
+        pad_x, pad_y = (self.imgsz - new_w) / 2, (self.imgsz - new_h) / 2
+
+        canvas = Image.new("RGB", (self.imgsz, self.imgsz), LETTERBOX_COLOR)
+        canvas.paste(image.resize((new_w, new_h), Image.BILINEAR),
+                     (round(pad_x - 0.1), round(pad_y - 0.1)))
+        array = np.asarray(canvas, dtype=np.float32).transpose(2, 0, 1) / 255.0
+        return array, ratio, (round(pad_x - 0.1), round(pad_y - 0.1)), (width, height)
+
+    @staticmethod
+    def _nms(boxes, scores, iou_threshold: float):
+        import numpy as np
+
+        x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+        areas = (x2 - x1) * (y2 - y1)
+        order = scores.argsort()[::-1]
+        keep = []
+        while order.size:
+            i = order[0]
+            keep.append(i)
+            rest = order[1:]
+            w = np.maximum(0.0, np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]))
+            h = np.maximum(0.0, np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]))
+            inter = w * h
+            iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+            order = rest[iou <= iou_threshold]
+        return np.array(keep, dtype=int)
+
+    def _postprocess(self, output, conf: float, ratio: float, pad, size) -> List[dict]:
+        import numpy as np
+
+        preds = output.T  # (후보 수, 4 + 클래스 수)
+        scores_all = preds[:, 4:]
+        class_ids = scores_all.argmax(axis=1)
+        scores = scores_all[np.arange(len(preds)), class_ids]
+        mask = scores >= conf
+        if not mask.any():
+            return []
+        preds, class_ids, scores = preds[mask], class_ids[mask], scores[mask]
+
+        cx, cy, w, h = preds[:, 0], preds[:, 1], preds[:, 2], preds[:, 3]
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        keep = self._nms(boxes + (class_ids * MAX_WH)[:, None], scores, MODEL_IOU_THRESHOLD)[:MODEL_MAX_DET]
+
+        width, height = size
+        boxes = boxes[keep]
+        boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - pad[0]) / ratio).clip(0, width)
+        boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - pad[1]) / ratio).clip(0, height)
+
+        detections = [
+            _detection(int(class_ids[k]), self.names, float(scores[k]), box)
+            for k, box in zip(keep, boxes)
+        ]
+        detections.sort(key=lambda d: d["confidence"], reverse=True)
+        return detections
+
+    def predict(self, images: list, conf: float) -> List[List[dict]]:
+        import numpy as np
+
+        prepared = [self._letterbox(image) for image in images]
+        if self.dynamic_batch:
+            batch = np.stack([array for array, _, _, _ in prepared])
+            outputs = self.session.run(None, {self.input_name: batch})[0]
+        else:
+            outputs = [self.session.run(None, {self.input_name: array[None]})[0][0]
+                       for array, _, _, _ in prepared]
+        return [
+            self._postprocess(output, conf, ratio, pad, size)
+            for output, (_, ratio, pad, size) in zip(outputs, prepared)
+        ]
+
+
+def load_backend(path: Path):
+    """확장자로 백엔드 선택 (.onnx → ONNX Runtime, 그 외 → Ultralytics)"""
+    path = Path(path)
+    if path.suffix == ".onnx":
+        return OnnxBackend(path)
+    return TorchBackend(path)
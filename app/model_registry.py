@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from fastapi import HTTPException
+
+from app.detection_cache import model_identity
+
+logger = logging.getLogger(__name__)
+
+
+class LoadedModel:
+    def __init__(self, name: str, model: Any, labels: dict, model_id: str, load_seconds: float):
+        self.name = name
+        self.model = model
+        self.labels = labels
+        self.model_id = model_id
+        self.load_seconds = load_seconds
+
+
+class ModelRegistry:
+    """
+    탐지 모델을 처음 쓸 때(또는 warm_up 호출 시) 한 번만 로드하는 thread-safe 레지스트리
+    - 모델 파일이 바뀌면(model_identity 변경) 다음 요청에서 다시 로드
+    - 파일이 없으면 import 시점이 아니라 요청 시점에 503
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, tuple] = {}
+        self._loaded: Dict[str, LoadedModel] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def register(self, name: str, path: Path, loader: Callable[[Path], Any], description: str = ""):
+        self._specs[name] = (Path(path), loader, description or name)
+        self._locks[name] = threading.Lock()
+
+    def names(self) -> list:
+        return list(self._specs)
+
+    def identity(self, name: str) -> Optional[str]:
+        path, _, _ = self._specs[name]
+        return model_identity(path) if path.exists() else None
+
+    def get(self, name: str) -> LoadedModel:
+        path, loader, description = self._specs[name]
+        if not path.exists():
+            raise HTTPException(status_code=503, detail=f"{description} 모델이 존재하지 않습니다: {path.name}")
+
+        current_id = model_identity(path)
+        loaded = self._loaded.get(name)
+        if loaded is not None and loaded.model_id == current_id:
+            return loaded
+
+        with self._locks[name]:
+            loaded = self._loaded.get(name)
+            if loaded is not None and loaded.model_id == current_id:
+                return loaded
+            started = time.perf_counter()
+            model = loader(path)
+            loaded = LoadedModel(name, model, model.names, current_id, time.perf_counter() - started)
+            self._loaded[name] = loaded
+            logger.info("✅ [%s] 모델 로드 완료 (%.2fs, %s)", name, loaded.load_seconds, current_id)
+            return loaded
+
+    def warm_up(self, names: Optional[Iterable[str]] = None):
+        for name in names or self.names():
+            try:
+                self.get(name)
+            except HTTPException as e:
+                logger.warning("⚠️ [%s] 모델 warm-up 실패: %s", name, e.detail)
+
+    def status(self) -> list:
+        return [
+            {
+                "name": name,
+                "loaded": name in self._loaded,
+                "model_id": self._loaded[name].model_id if name in self._loaded else None,
+                "load_seconds": self._loaded[name].load_seconds if name in self._loaded else None,
+            }
+            for name in self._specs
+        ]
+
+
+model_registry = ModelRegistry()
@@ -0,0 +1,75 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+# 커서 = (정렬 필드 값, _id)를 담은 불투명 문자열
+def encode_cursor(sort_value: datetime, oid: ObjectId) -> str:
+    payload = {"t": sort_value.isoformat(), "id": str(oid)}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        # 예전 커서에 있던 "n"(누적 개수)은 무시
+        return {
+            "t": datetime.fromisoformat(payload["t"]),
+            "id": ObjectId(payload["id"]),
+        }
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="⚠️ 잘못된 커서 값입니다.")
+
+
+def seek_filter(query: dict, cursor: Optional[dict], field: str = "created_at") -> dict:
+    """(field, _id) 내림차순 정렬 기준으로 커서 다음 위치부터 찾는 조건"""
+    if cursor is None:
+        return query
+    seek = {"$or": [
+        {field: {"$lt": cursor["t"]}},
+        {field: cursor["t"], "_id": {"$lt": cursor["id"]}},
+    ]}
+    if not query:
+        return seek
+    return {"$and": [query, seek]}
+
+
+def seek_sort(field: str = "created_at") -> list:
+    return [(field, -1), ("_id", -1)]
+
+
+def _page_end(docs: list, limit: int, field: str):
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor(last[field], last["_id"])
+    return docs, next_cursor
+
+
+async def apaginate(collection, query: dict, cursor: Optional[str], limit: int,
+                    projection: Optional[dict] = None, field: str = "created_at"):
+    """
+    키셋 페이지네이션 공통 처리 (AsyncMongoClient 컬렉션용)
+    - limit + 1 개를 읽어 다음 페이지 존재 여부를 판단
+    - 반환: (문서 리스트, next_cursor)
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    decoded = decode_cursor(cursor) if cursor else None
+    docs = await (
+        collection.find(seek_filter(query, decoded, field), projection)
+        .sort(seek_sort(field))
+        .limit(limit + 1)
+        .to_list()
+    )
+    return _page_end(docs, limit, field)
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+# bcrypt 비용(2^rounds), 바꾸면 다음 로그인 때 자동으로 다시 해시
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# 해시 전용 스레드 수 (bcrypt 는 해시 중 GIL 을 놓기 때문에 스레드로 충분)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+# 실행 중 + 대기 중 작업이 이 값을 넘으면 429 로 바로 거절
+PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv("PASSWORD_HASH_QUEUE_DEPTH", "32"))
+PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "10"))
+
+_BCRYPT_COST = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_DEPTH)
+
+
+async def _run(fn, *args):
+    """해시 풀에서 실행하고 이벤트 루프를 막지 않고 기다림 (풀이 가득 차면 429)"""
+    if not _slots.acquire(blocking=False):
+        raise HTTPException(status_code=429, detail="⏳ 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+                            headers={"Retry-After": "1"})
+    try:
+        future = _executor.submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), PASSWORD_HASH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="⏳ 인증 처리 지연, 잠시 후 다시 시도해주세요.")
+
+
+def _hash(password: str, rounds: int) -> str:
+    import bcrypt
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _check(password: str, hashed: str) -> bool:
+    import bcrypt
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+    except ValueError:
+        return False  # 형식이 깨진 해시
+
+
+async def hash_password(password: str) -> str:
+    return await _run(_hash, password, BCRYPT_ROUNDS)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await _run(_check, password, hashed)
+
+
+def needs_rehash(hashed: str) -> bool:
+    """저장된 해시의 비용이 BCRYPT_ROUNDS 와 다르면 True"""
+    match = _BCRYPT_COST.match(hashed or "")
+    return match is None or int(match.group(1)) != BCRYPT_ROUNDS
+
+
+def metrics() -> dict:
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "queue_depth": PASSWORD_HASH_QUEUE_DEPTH,
+        "rounds": BCRYPT_ROUNDS,
+    }
+
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,128 @@
+import logging
+import os
+import threading
+from collections import deque
+from datetime import timedelta
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RECENT_REPORTS_CAPACITY = int(os.getenv("RECENT_REPORTS_CAPACITY", "200"))
+# 다른 워커가 넣은 신고를 백그라운드에서 따라잡는 주기 (0 이면 따라잡지 않음, 단일 워커용)
+RECENT_REPORTS_RESYNC_SECONDS = float(os.getenv("RECENT_REPORTS_RESYNC_SECONDS", "2"))
+# 워커 간 시계/커밋 순서 차이를 흡수하기 위해 high-water-mark 보다 조금 앞부터 다시 읽음
+RECENT_REPORTS_SKEW_SECONDS = float(os.getenv("RECENT_REPORTS_SKEW_SECONDS", "5"))
+
+class RecentReportsBuffer:
+    """
+    최근 신고 N건 링 버퍼 (프로세스 로컬)
+    - 시작 시 warm(), 신고 생성 시 push()
+    - 신고 삭제/숨김 기능이 아직 없어서 버퍼에서 빼는 경로도 없음 (추가할 때 함께 구현)
+    - 다른 워커의 신고는 백그라운드 스레드가 (created_at, _id) high-water-mark 이후만 읽어 합침
+    - 조회 projection / 응답 형식은 warm() 에서 받음 (crud 의 목록 조회와 같은 것을 사용)
+    """
+
+    def __init__(self, capacity: int = RECENT_REPORTS_CAPACITY):
+        self.capacity = capacity
+        self._items = deque(maxlen=capacity)  # (created_at, _id, entry), 최신이 앞
+        self._lock = threading.Lock()
+        self._collection = None
+        self._projection = None
+        self._format: Optional[Callable[[dict], dict]] = None
+        self._warm = False
+        self._syncer: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.resyncs = 0
+
+    def warm(self, collection, projection: dict, format_entry: Callable[[dict], dict]):
+        self._collection = collection
+        self._projection = projection
+        self._format = format_entry
+        docs = list(
+            collection.find({}, projection)
+            .sort([("created_at", -1), ("_id", -1)])
+            .limit(self.capacity)
+        )
+        with self._lock:
+            self._items = deque(
+                ((d["created_at"], d["_id"], format_entry(d)) for d in docs),
+                maxlen=self.capacity
+            )
+            self._warm = True
+        logger.info("✅ 최근 신고 버퍼 %d건 적재", len(docs))
+
+    def _merge(self, docs: list):
+        """새로 읽은 문서를 정렬 순서를 유지하며 합침 (이미 있는 _id 는 무시)"""
+        with self._lock:
+            known = {oid for _, oid, _ in self._items}
+            fresh = [(d["created_at"], d["_id"], self._format(d)) for d in docs if d["_id"] not in known]
+            if not fresh:
+                return
+            merged = sorted(list(self._items) + fresh, key=lambda item: (item[0], item[1]), reverse=True)
+            self._items = deque(merged[:self.capacity], maxlen=self.capacity)
+
+    def push(self, report: dict):
+        if not self._warm:
+            return
+        self._merge([report])
+
+    def resync(self):
+        """high-water-mark 이후 신고만 조회 (created_at_id 인덱스로 보통 0건)"""
+        if self._collection is None:
+            return
+        with self._lock:
+            high_water = self._items[0][0] if self._items else None
+        query = {}
+        if high_water is not None:
+            query = {"created_at": {"$gte": high_water - timedelta(seconds=RECENT_REPORTS_SKEW_SECONDS)}}
+        docs = list(
+            self._collection.find(query, self._projection)
+            .sort([("created_at", -1), ("_id", -1)])
+            .limit(self.capacity)
+        )
+        self.resyncs += 1
+        self._merge(docs)
+
+    def get(self, limit: int) -> Optional[List[dict]]:
+        """버퍼로 응답 가능하면 리스트, 아니면 None (호출 측에서 Mongo 조회)"""
+        if not self._warm or limit > self.capacity:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self._lock:
+            return [entry for _, _, entry in list(self._items)[:max(limit, 0)]]
+
+    def _resync_loop(self):
+        while not self._stopped.wait(RECENT_REPORTS_RESYNC_SECONDS):
+            try:
+                self.resync()
+            except Exception:
+                logger.exception("⚠️ 최근 신고 버퍼 동기화 실패, 다음 주기에 재시도")
+
+    def start(self):
+        """백그라운드 따라잡기 시작 (warm() 이후, 주기가 0 이면 시작하지 않음)"""
+        if RECENT_REPORTS_RESYNC_SECONDS <= 0 or self._syncer is not None:
+            return
+        self._stopped.clear()
+        self._syncer = threading.Thread(target=self._resync_loop, name="recent-reports-resync", daemon=True)
+        self._syncer.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._syncer is not None:
+            self._syncer.join(timeout=5)
+            self._syncer = None
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "size": len(self._items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "resyncs": self.resyncs,
+        }
+
+
+recent_reports = RecentReportsBuffer()
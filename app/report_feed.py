@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.image_pipeline import smallest_thumbnail_url
+
+logger = logging.getLogger(__name__)
+
+# local: create_damage_report 에서 직접 발행 / changestream: Mongo change stream 구독 (멀티 워커용)
+REPORT_FEED_SOURCE = os.getenv("REPORT_FEED_SOURCE", "local").lower()
+REPORT_FEED_QUEUE_SIZE = int(os.getenv("REPORT_FEED_QUEUE_SIZE", "100"))
+REPORT_FEED_MAX_SUBSCRIBERS = int(os.getenv("REPORT_FEED_MAX_SUBSCRIBERS", "1000"))
+REPORT_FEED_HEARTBEAT_SECONDS = float(os.getenv("REPORT_FEED_HEARTBEAT_SECONDS", "15"))
+
+
+def report_event(report: dict) -> dict:
+    """신고 문서 → 구독자에게 보낼 요약"""
+    files = report.get("files") or []
+    created_at = report.get("created_at")
+    return {
+        "id": str(report["_id"]),
+        "title": report.get("title"),
+        "main_category": report.get("main_category"),
+        "sub_category": report.get("sub_category"),
+        "local": report.get("local"),
+        "latitude": report.get("latitude"),
+        "longitude": report.get("longitude"),
+        "created_at": created_at.isoformat() if created_at else None,
+        "thumbnail_url": smallest_thumbnail_url(files[0]) if files else None,
+    }
+
+
+class Subscriber:
+    """구독자 1명: 필터 + 크기 제한 큐 (가득 차면 오래된 것부터 버리고 lagged 로 알림)"""
+
+    def __init__(self, filters: dict, maxsize: int = REPORT_FEED_QUEUE_SIZE):
+        self.filters = filters
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def matches(self, event: dict) -> bool:
+        f = self.filters
+        for key in ("main_category", "sub_category", "local"):
+            if f.get(key) and event.get(key) != f[key]:
+                return False
+        bbox = f.get("bbox")
+        if bbox:
+            lat, lng = event.get("latitude"), event.get("longitude")
+            if lat is None or lng is None:
+                return False
+            min_lng, min_lat, max_lng, max_lat = bbox
+            if not (min_lng <= lng <= max_lng and min_lat <= lat <= max_lat):
+                return False
+        return True
+
+    def offer(self, event: dict):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class ReportBroadcaster:
+    """새 신고 1건을 모든 구독자에게 나눠주는 공유 피드 (DB 조회 없음)"""
+
+    def __init__(self, source: str = REPORT_FEED_SOURCE):
+        self.source = source
+        self._subscribers = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self.published = 0
+
+    def start(self, loop: asyncio.AbstractEventLoop, collection=None):
+        self._loop = loop
+        if self.source == "changestream" and collection is not None and self._watcher is None:
+            self._watcher = threading.Thread(
+                target=self._watch, args=(collection,), name="report-feed-watch", daemon=True
+            )
+            self._watcher.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def check_capacity(self):
+        """응답을 시작하기 전에 호출 (구독 등록은 sse_stream 안에서)"""
+        if len(self._subscribers) >= REPORT_FEED_MAX_SUBSCRIBERS:
+            raise HTTPException(status_code=503, detail="실시간 구독자가 너무 많습니다.")
+
+    def subscribe(self, filters: dict) -> Subscriber:
+        subscriber = Subscriber(filters)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def publish(self, event: dict):
+        """어느 스레드에서든 호출 가능 (실제 전달은 이벤트 루프에서)"""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._fan_out, event)
+
+    def publish_local(self, report: dict):
+        """create_damage_report 에서 호출 - change stream 모드에서는 중복 방지를 위해 무시"""
+        if self.source == "local":
+            self.publish(report_event(report))
+
+    def _fan_out(self, event: dict):
+        self.published += 1
+        for subscriber in list(self._subscribers):
+            if subscriber.matches(event):
+                subscriber.offer(event)
+
+    def _watch(self, collection):
+        pipeline = [{"$match": {"operationType": "insert"}}]
+        resume_token = None
+        while not self._stopped.is_set():
+            try:
+                with collection.watch(pipeline, resume_after=resume_token) as stream:
+                    for change in stream:
+                        resume_token = stream.resume_token
+                        self.publish(report_event(change["fullDocument"]))
+                        if self._stopped.is_set():
+                            break
+            except Exception:
+                logger.exception("❌ 신고 change stream 오류, 5초 후 재연결")
+                self._stopped.wait(5)
+
+    def metrics(self) -> dict:
+        return {
+            "source": self.source,
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": sum(s.dropped for s in self._subscribers),
+        }
+
+
+report_feed = ReportBroadcaster()
+
+
+async def sse_stream(request, filters: dict):
+    """
+    text/event-stream 본문 생성 (heartbeat 로 연결 유지, 밀린 개수는 lagged 이벤트로 알림)
+    - 구독은 제너레이터가 실제로 시작된 뒤 등록 (첫 반복 전에 끊기면 finally 가 안 돌아서 새므로)
+    """
+    subscriber = report_feed.subscribe(filters)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            if await request.is_disconnected():
+                break
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), REPORT_FEED_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if subscriber.dropped:
+                yield f"event: lagged\ndata: {json.dumps({'dropped': subscriber.dropped})}\n\n"
+                subscriber.dropped = 0
+            yield f"event: report\nid: {event['id']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+    finally:
+        report_feed.unsubscribe(subscriber)
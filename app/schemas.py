@@ -39,6 +39,9 @@ class PostUpdate(BaseModel):
     content: Optional[str] = None
     tags: Optional[List[str]] = None
 
+class LikeStatusBatchRequest(BaseModel):
+    post_ids: List[str]
+
 class CommentCreate(BaseModel):
     post_id: str
     content: str
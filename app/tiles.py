@@ -0,0 +1,149 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from pymongo import UpdateOne
+
+from app.database import db
+
+# quadkey 는 이 줌 레벨 기준으로 신고 문서에 저장
+TILE_MAX_ZOOM = 18
+# 타일 하나를 2^depth x 2^depth 셀로 나눠서 클러스터링 (응답 최대 4^depth 개)
+CLUSTER_DEPTH = int(os.getenv("TILE_CLUSTER_DEPTH", "3"))
+TILE_CACHE_TTL_SECONDS = float(os.getenv("TILE_CACHE_TTL_SECONDS", "30"))
+TILE_CACHE_SIZE = int(os.getenv("TILE_CACHE_SIZE", "2048"))
+MAX_LATITUDE = 85.05112878
+
+report_tiles_collection = db["report_tiles"]
+
+
+def lat_lng_to_tile(latitude: float, longitude: float, zoom: int):
+    """위도/경도 → Web Mercator 타일 (x, y)"""
+    latitude = max(-MAX_LATITUDE, min(MAX_LATITUDE, latitude))
+    n = 2 ** zoom
+    x = int((longitude + 180.0) / 360.0 * n)
+    lat_rad = math.radians(latitude)
+    y = int((1.0 - math.log(math.tan(lat_rad) + 1 / math.cos(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_to_quadkey(x: int, y: int, zoom: int) -> str:
+    digits = []
+    for level in range(zoom, 0, -1):
+        mask = 1 << (level - 1)
+        digit = (1 if x & mask else 0) + (2 if y & mask else 0)
+        digits.append(str(digit))
+    return "".join(digits)
+
+
+def quadkey_for(latitude: Optional[float], longitude: Optional[float]) -> Optional[str]:
+    if latitude is None or longitude is None:
+        return None
+    return tile_to_quadkey(*lat_lng_to_tile(latitude, longitude, TILE_MAX_ZOOM), TILE_MAX_ZOOM)
+
+
+def _count_key(sub_category: Optional[str]) -> str:
+    # Mongo 필드 이름에 '.', '$' 는 쓸 수 없음
+    return (sub_category or "기타").replace(".", "_").replace("$", "_")
+
+
+class TileCache:
+    """타일 키(z/x/y) → 응답 (TTL + LRU 개수 제한), 새 신고가 들어오면 해당 타일들만 무효화"""
+
+    def __init__(self, ttl: float = TILE_CACHE_TTL_SECONDS, capacity: int = TILE_CACHE_SIZE):
+        self.ttl = ttl
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, quadkey: str):
+        with self._lock:
+            entry = self._entries.get(quadkey)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(quadkey)
+                return entry[1]
+            self._entries.pop(quadkey, None)
+            return None
+
+    def put(self, quadkey: str, value: dict):
+        with self._lock:
+            self._entries[quadkey] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(quadkey)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)  # 가장 오래 안 쓴 타일부터
+
+    def invalidate_point(self, quadkey: str):
+        with self._lock:
+            for level in range(len(quadkey) + 1):
+                self._entries.pop(quadkey[:level], None)
+
+
+tile_cache = TileCache()
+
+
+def record_report_tiles(quadkey: Optional[str], sub_category: Optional[str],
+                        latitude: Optional[float], longitude: Optional[float]):
+    """신고 1건을 모든 줌 레벨의 셀 집계에 반영 (bulk upsert 1회)"""
+    if not quadkey:
+        return
+    now = datetime.utcnow()
+    report_tiles_collection.bulk_write([
+        UpdateOne(
+            {"_id": quadkey[:level]},
+            {
+                "$inc": {
+                    "total": 1,
+                    f"counts.{_count_key(sub_category)}": 1,
+                    "sum_lat": latitude,
+                    "sum_lng": longitude,
+                },
+                "$set": {"z": level, "updated_at": now},
+            },
+            upsert=True,
+        )
+        for level in range(1, TILE_MAX_ZOOM + 1)
+    ], ordered=False)
+    tile_cache.invalidate_point(quadkey)
+
+
+def get_tile_clusters(z: int, x: int, y: int) -> dict:
+    """타일(z/x/y) 안의 신고를 셀 단위 클러스터로 집계해서 반환"""
+    if not 0 <= z <= TILE_MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=400, detail="⚠️ 잘못된 타일 좌표입니다.")
+
+    prefix = tile_to_quadkey(x, y, z)
+    cached = tile_cache.get(prefix)
+    if cached is not None:
+        return cached
+
+    level = max(1, min(z + CLUSTER_DEPTH, TILE_MAX_ZOOM))
+    query = {"z": level}
+    if prefix:
+        query["_id"] = {"$regex": f"^{prefix}"}
+
+    clusters = []
+    total = 0
+    for cell in report_tiles_collection.find(query).sort("_id", 1):
+        if not cell.get("total"):
+            continue
+        total += cell["total"]
+        clusters.append({
+            "key": cell["_id"],
+            "count": cell["total"],
+            "latitude": cell["sum_lat"] / cell["total"],
+            "longitude": cell["sum_lng"] / cell["total"],
+            "counts": cell.get("counts", {}),
+        })
+
+    body = {"tile": f"{z}/{x}/{y}", "cell_zoom": level, "total": total, "clusters": clusters}
+    etag = hashlib.sha1(json.dumps(body, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+    result = {"etag": f'"{etag}"', "body": body}
+    tile_cache.put(prefix, result)
+    return result
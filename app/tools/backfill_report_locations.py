@@ -0,0 +1,56 @@
+"""
+기존 신고의 latitude/longitude 로 GeoJSON location 필드 채우기 (2dsphere 인덱스용)
+
+    python -m app.tools.backfill_report_locations [--batch-size 500]
+"""
+import argparse
+import sys
+
+from pymongo import UpdateOne
+
+from app.database import tool_database
+
+damage_report_collection = tool_database()["damage_report"]
+
+
+def backfill(batch_size: int = 500) -> int:
+    query = {
+        "location": None,
+        "latitude": {"$type": "number", "$gte": -90, "$lte": 90},
+        "longitude": {"$type": "number", "$gte": -180, "$lte": 180},
+    }
+    updated = 0
+    last_id = None
+    while True:
+        batch_query = dict(query)
+        if last_id is not None:
+            batch_query["_id"] = {"$gt": last_id}
+        batch = list(
+            damage_report_collection.find(batch_query, {"latitude": 1, "longitude": 1})
+            .sort("_id", 1)
+            .limit(batch_size)
+        )
+        if not batch:
+            break
+        damage_report_collection.bulk_write([
+            UpdateOne({"_id": r["_id"]}, {"$set": {"location": {
+                "type": "Point", "coordinates": [r["longitude"], r["latitude"]]
+            }}})
+            for r in batch
+        ], ordered=False)
+        updated += len(batch)
+        last_id = batch[-1]["_id"]
+        print(f"… {updated}건 처리")
+    return updated
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="신고 location 필드 백필")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+    print(f"✅ location 백필 완료: {backfill(args.batch_size)}건")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+torch / ONNX 백엔드 지연시간과 메모리(RSS) 비교 (백엔드별로 새 프로세스에서 측정)
+
+    python -m app.tools.bench_backends IMAGE_DIR [--model Bug_Detect.pt] [--batch-size 4] [--iterations 20]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from app.model_backends import MODEL_DIR, onnx_path_for
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+def _measure(backend: str, model_path: Path, image_dir: Path, batch_size: int, iterations: int) -> dict:
+    import resource
+
+    from PIL import Image
+
+    from app.model_backends import load_backend
+
+    images = [Image.open(p).convert("RGB") for p in sorted(image_dir.iterdir())
+              if p.suffix.lower() in IMAGE_SUFFIXES]
+    batch = (images * batch_size)[:batch_size]
+
+    started = time.perf_counter()
+    model = load_backend(model_path)
+    load_s = time.perf_counter() - started
+
+    model.predict(batch, 0.25)  # warm-up
+    latencies = []
+    for _ in range(iterations):
+        t = time.perf_counter()
+        model.predict(batch, 0.25)
+        latencies.append(time.perf_counter() - t)
+
+    latencies.sort()
+    return {
+        "backend": backend,
+        "model": model_path.name,
+        "load_s": load_s,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "images_per_s": batch_size / statistics.mean(latencies),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="torch / ONNX 백엔드 벤치마크")
+    parser.add_argument("image_dir", type=Path)
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument("--model", default="Bug_Detect.pt")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--int8", action="store_true")
+    parser.add_argument("--child", choices=["torch", "onnx"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    pt_path = args.model_dir / args.model
+    paths = {"torch": pt_path, "onnx": onnx_path_for(pt_path, int8=args.int8)}
+
+    if args.child:
+        result = _measure(args.child, paths[args.child], args.image_dir, args.batch_size, args.iterations)
+        print(json.dumps(result))
+        return 0
+
+    print(f"{'backend':8} {'model':26} {'load(s)':>8} {'p50(ms)':>9} {'p95(ms)':>9} {'img/s':>7} {'RSS(MB)':>8}")
+    for backend in ("torch", "onnx"):
+        if not paths[backend].exists():
+            print(f"{backend:8} {paths[backend].name:26} (파일 없음)")
+            continue
+        child_args = [sys.executable, "-m", "app.tools.bench_backends", str(args.image_dir),
+                      "--model-dir", str(args.model_dir), "--model", args.model,
+                      "--batch-size", str(args.batch_size), "--iterations", str(args.iterations),
+                      "--child", backend] + (["--int8"] if args.int8 else [])
+        out = subprocess.run(child_args, check=True, capture_output=True, text=True)
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{r['backend']:8} {r['model']:26} {r['load_s']:8.2f} {r['p50_ms']:9.1f} "
+              f"{r['p95_ms']:9.1f} {r['images_per_s']:7.1f} {r['max_rss_mb']:8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
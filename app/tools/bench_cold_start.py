@@ -0,0 +1,59 @@
+"""
+워커 콜드 스타트 측정: 새 프로세스에서 모듈 import 시간과 최대 RSS
+
+    python -m app.tools.bench_cold_start [--module app.main] [--runs 5] [--warmup]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import importlib
+module = importlib.import_module({module!r})
+imported = time.perf_counter() - started
+warmup = None
+if {warmup!r}:
+    from app import crud
+    t = time.perf_counter()
+    crud.warm_up_models()
+    warmup = time.perf_counter() - t
+heavy = [m for m in ("torch", "ultralytics", "pandas", "numpy", "bs4", "requests", "PIL") if m in sys.modules]
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"import_s": imported, "warmup_s": warmup, "max_rss_mb": rss_kb / 1024, "heavy_modules": heavy}}))
+"""
+
+
+def run_once(module: str, warmup: bool) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, warmup=warmup)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="import 시간 / RSS 벤치마크")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", action="store_true", help="모델 warm-up 시간까지 측정")
+    args = parser.parse_args(argv)
+
+    samples = [run_once(args.module, args.warmup) for _ in range(args.runs)]
+    import_times = [s["import_s"] for s in samples]
+    rss = [s["max_rss_mb"] for s in samples]
+    print(f"module        : {args.module}")
+    print(f"import (median): {statistics.median(import_times) * 1000:.0f} ms "
+          f"(min {min(import_times) * 1000:.0f} / max {max(import_times) * 1000:.0f})")
+    print(f"max RSS (median): {statistics.median(rss):.1f} MB")
+    if args.warmup:
+        print(f"warm-up (median): {statistics.median(s['warmup_s'] for s in samples):.2f} s")
+    print(f"heavy modules : {', '.join(samples[-1]['heavy_modules']) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
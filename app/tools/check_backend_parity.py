@@ -0,0 +1,89 @@
+"""
+torch 백엔드와 ONNX 백엔드의 탐지 결과 일치 여부 검사
+
+    python -m app.tools.check_backend_parity IMAGE_DIR [--int8] [--min-agreement 0.9]
+
+같은 클래스이면서 IoU >= --iou 인 박스끼리 짝을 지어
+양쪽 모두에서 짝을 찾은 비율이 --min-agreement 미만이면 실패
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from app.model_backends import MODEL_DIR, OnnxBackend, TorchBackend, onnx_path_for
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+def iou(a: dict, b: dict) -> float:
+    w = max(0.0, min(a["x2"], b["x2"]) - max(a["x1"], b["x1"]))
+    h = max(0.0, min(a["y2"], b["y2"]) - max(a["y1"], b["y1"]))
+    inter = w * h
+    union = (a["x2"] - a["x1"]) * (a["y2"] - a["y1"]) + (b["x2"] - b["x1"]) * (b["y2"] - b["y1"]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def match(reference: list, candidate: list, iou_threshold: float):
+    """신뢰도 높은 순으로 greedy 매칭 → (짝 지어진 IoU 리스트, 짝 없는 reference 수, 짝 없는 candidate 수)"""
+    used = set()
+    ious = []
+    for ref in reference:
+        best, best_iou = None, iou_threshold
+        for j, cand in enumerate(candidate):
+            if j in used or cand["class_id"] != ref["class_id"]:
+                continue
+            value = iou(ref["bbox"], cand["bbox"])
+            if value >= best_iou:
+                best, best_iou = j, value
+        if best is not None:
+            used.add(best)
+            ious.append(best_iou)
+    return ious, len(reference) - len(ious), len(candidate) - len(used)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="torch / ONNX 탐지 결과 parity 검사")
+    parser.add_argument("image_dir", type=Path)
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument("--int8", action="store_true")
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--iou", type=float, default=0.5)
+    parser.add_argument("--min-agreement", type=float, default=0.9)
+    args = parser.parse_args(argv)
+
+    from PIL import Image
+
+    image_paths = sorted(p for p in args.image_dir.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not image_paths:
+        print(f"❌ 이미지가 없습니다: {args.image_dir}")
+        return 1
+    images = [Image.open(p).convert("RGB") for p in image_paths]
+
+    failed = False
+    for pt_path in sorted(args.model_dir.glob("*.pt")):
+        torch_backend = TorchBackend(pt_path)
+        onnx_backend = OnnxBackend(onnx_path_for(pt_path, int8=args.int8))
+
+        matched_ious, missing, extra, total = [], 0, 0, 0
+        for image in images:
+            reference = torch_backend.predict([image], args.conf)[0]
+            candidate = onnx_backend.predict([image], args.conf)[0]
+            ious, ref_unmatched, cand_unmatched = match(reference, candidate, args.iou)
+            matched_ious.extend(ious)
+            missing += ref_unmatched
+            extra += cand_unmatched
+            total += len(reference) + len(candidate)
+
+        agreement = 2 * len(matched_ious) / total if total else 1.0
+        mean_iou = sum(matched_ious) / len(matched_ious) if matched_ious else None
+        status = "ok" if agreement >= args.min_agreement else "FAIL"
+        failed |= status == "FAIL"
+        mean_iou_text = f"{mean_iou:.3f}" if mean_iou is not None else "-"
+        print(f"{status:4} {pt_path.name:24} agreement={agreement:.3f} mean_iou={mean_iou_text} "
+              f"matched={len(matched_ious)} torch_only={missing} onnx_only={extra}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+crud.py / async_crud.py 의 쿼리 형태마다 explain() 을 실행해서 COLLSCAN 이 있으면 실패
+
+    python -m app.tools.check_query_plans [--ensure-indexes]
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.database import tool_database
+from app.indexes import ensure_indexes
+from app.pagination import seek_filter, seek_sort
+
+db = tool_database()
+
+SAMPLE_OID = ObjectId()
+SAMPLE_ID = str(SAMPLE_OID)
+SAMPLE_CURSOR = {"t": datetime.utcnow(), "id": SAMPLE_OID}
+
+# (이름, 컬렉션, filter, sort, limit)
+QUERY_SHAPES = [
+    ("users.by_email", "users", {"email": "probe@example.com"}, None, 1),
+    ("users.by_id", "users", {"_id": SAMPLE_OID}, None, 1),
+    ("post.list", "post", {}, seek_sort(), 21),
+    ("post.list.cursor", "post", seek_filter({}, SAMPLE_CURSOR), seek_sort(), 21),
+    ("post.local", "post", {"local_id": 1}, seek_sort(), 21),
+    ("post.local.cursor", "post", seek_filter({"local_id": 1}, SAMPLE_CURSOR), seek_sort(), 21),
+    ("post.by_id", "post", {"_id": SAMPLE_OID}, None, 1),
+    ("comments.by_post", "comments", {"post_id": SAMPLE_ID}, seek_sort(), 21),
+    ("comments.by_post.cursor", "comments", seek_filter({"post_id": SAMPLE_ID}, SAMPLE_CURSOR), seek_sort(), 21),
+    ("comments.by_id_owner", "comments", {"_id": SAMPLE_OID, "user_id": SAMPLE_ID}, None, 1),
+    ("post_likes.by_post_user", "post_likes", {"post_id": SAMPLE_ID, "user_id": SAMPLE_ID}, None, 1),
+    ("post_likes.by_posts_user", "post_likes", {"post_id": {"$in": [SAMPLE_ID]}, "user_id": SAMPLE_ID}, None, 0),
+    ("post.by_ids", "post", {"_id": {"$in": [SAMPLE_OID]}}, None, 0),
+    ("users.by_ids", "users", {"_id": {"$in": [SAMPLE_OID]}}, None, 0),
+    ("post_likes.by_post.cursor", "post_likes",
+     seek_filter({"post_id": SAMPLE_ID}, SAMPLE_CURSOR, "liked_at"), seek_sort("liked_at"), 21),
+    ("post_likes.by_post", "post_likes", {"post_id": SAMPLE_ID}, [("liked_at", -1)], 20),
+    ("damage_report.by_user", "damage_report", {"user_id": SAMPLE_ID}, None, 0),
+    ("damage_report.by_id", "damage_report", {"_id": SAMPLE_OID}, None, 1),
+    ("damage_report.recent", "damage_report", {}, [("created_at", -1)], 20),
+    ("damage_report.bbox", "damage_report", {"location": {"$geoWithin": {"$geometry": {
+        "type": "Polygon",
+        "coordinates": [[[126.9, 37.5], [127.1, 37.5], [127.1, 37.6], [126.9, 37.6], [126.9, 37.5]]],
+    }}}, "sub_category": "해충"}, seek_sort(), 21),
+    ("damage_report.nearby", "damage_report", {"location": {"$geoWithin": {
+        "$centerSphere": [[127.0, 37.5], 1000 / 6378100],
+    }}}, seek_sort(), 21),
+    ("report_tiles.tile", "report_tiles", {"z": 10, "_id": {"$regex": "^1302"}}, [("_id", 1)], 0),
+    ("detection_jobs.claim.queued", "detection_jobs",
+     {"queue": "detection", "status": "queued", "run_after": {"$lte": datetime.utcnow()}}, [("run_after", 1)], 1),
+    ("detection_jobs.claim.expired", "detection_jobs",
+     {"queue": "detection", "status": "running", "lease_until": {"$lt": datetime.utcnow()}}, None, 1),
+    ("detection_cache.stale", "detection_cache", {"model_name": "pest", "model_id": {"$ne": "probe"}}, None, 0),
+]
+
+
+def _stages(plan):
+    """winningPlan 트리 안의 stage 이름을 모두 꺼냄"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _stages(item)
+
+
+def winning_stages(explain: dict) -> list:
+    planner = explain.get("queryPlanner", {})
+    plans = [planner.get("winningPlan", {})]
+    # 샤딩 환경은 샤드별 winningPlan 을 확인
+    for shard in planner.get("winningPlan", {}).get("shards", []):
+        plans.append(shard.get("winningPlan", {}))
+    stages = []
+    for plan in plans:
+        stages.extend(_stages(plan))
+    return stages
+
+
+def check_query_plans(shapes=QUERY_SHAPES) -> list:
+    failures = []
+    for name, collection_name, query, sort, limit in shapes:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+        stages = winning_stages(cursor.explain())
+        status = "COLLSCAN" if "COLLSCAN" in stages else "ok"
+        print(f"{status:8} {name:32} {' > '.join(stages)}")
+        if status == "COLLSCAN":
+            failures.append(name)
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="crud.py 쿼리 플랜 검증")
+    parser.add_argument("--ensure-indexes", action="store_true", help="검증 전에 인덱스 생성")
+    args = parser.parse_args(argv)
+
+    if args.ensure_indexes:
+        ensure_indexes(db)
+
+    failures = check_query_plans()
+    if failures:
+        print(f"❌ COLLSCAN 발생: {', '.join(failures)}")
+        return 1
+    print("✅ 모든 쿼리가 인덱스를 사용합니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""
+참조가 없는 blob 삭제 (신고 저장에 실패한 업로드가 남긴 파일)
+
+    python -m app.tools.collect_blob_garbage [--grace-hours 24] [--dry-run]
+"""
+import argparse
+import sys
+
+from app.blob_refs import BLOB_GC_GRACE_SECONDS, collect_garbage
+from app.blob_store import get_blob_store
+from app.database import tool_database
+from app.image_pipeline import THUMBNAIL_SIZES
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="참조 없는 blob 정리")
+    parser.add_argument("--grace-hours", type=float, default=BLOB_GC_GRACE_SECONDS / 3600,
+                        help="참조가 0 이 된 뒤 이 시간이 지난 것만 삭제")
+    parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 건수만 출력")
+    args = parser.parse_args(argv)
+
+    removed = collect_garbage(
+        get_blob_store(), tool_database()["damage_report"], THUMBNAIL_SIZES,
+        grace_seconds=int(args.grace_hours * 3600), dry_run=args.dry_run,
+    )
+    print(f"✅ 참조 없는 blob {removed}건 {'발견' if args.dry_run else '삭제'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+탐지 모델(.pt)을 ONNX 로 export (선택적으로 INT8 동적 양자화)
+
+    python -m app.tools.export_models [--imgsz 640] [--int8] [--model Bug_Detect.pt ...]
+
+결과는 .pt 와 같은 폴더에 X.onnx / X.int8.onnx 로 저장되고
+MODEL_BACKEND=onnx (ONNX_INT8=true) 로 실행하면 사용됨
+"""
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+from app.model_backends import MODEL_DIR, onnx_path_for
+
+
+def export_onnx(pt_path: Path, imgsz: int, opset: int) -> Path:
+    from ultralytics import YOLO
+
+    exported = Path(YOLO(str(pt_path)).export(
+        format="onnx", imgsz=imgsz, dynamic=True, simplify=True, opset=opset
+    ))
+    target = onnx_path_for(pt_path, int8=False)
+    if exported.resolve() != target.resolve():
+        shutil.move(str(exported), target)
+    return target
+
+
+def quantize_int8(onnx_path: Path, pt_path: Path) -> Path:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    target = onnx_path_for(pt_path, int8=True)
+    quantize_dynamic(str(onnx_path), str(target), weight_type=QuantType.QUInt8)
+    return target
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="YOLO .pt → ONNX export")
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument("--model", action="append", help="export 할 .pt 파일명 (기본: 폴더 내 전체)")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--int8", action="store_true", help="INT8 동적 양자화 모델도 생성")
+    args = parser.parse_args(argv)
+
+    pt_paths = [args.model_dir / name for name in args.model] if args.model \
+        else sorted(args.model_dir.glob("*.pt"))
+    if not pt_paths:
+        print(f"❌ export 할 모델이 없습니다: {args.model_dir}")
+        return 1
+
+    for pt_path in pt_paths:
+        onnx_path = export_onnx(pt_path, args.imgsz, args.opset)
+        print(f"✅ {pt_path.name} → {onnx_path.name}")
+        if args.int8:
+            int8_path = quantize_int8(onnx_path, pt_path)
+            print(f"✅ {onnx_path.name} → {int8_path.name} (INT8)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+damage_report.files[].base64_data 를 blob store 로 옮기고 참조(sha256, size, width, height)만 남김
+
+    python -m app.tools.migrate_report_files [--batch-size 50] [--dry-run]
+"""
+import argparse
+import base64
+import sys
+
+from pymongo import UpdateOne
+
+from app.blob_store import get_blob_store, image_dimensions
+from app.database import tool_database
+
+damage_report_collection = tool_database()["damage_report"]
+
+
+def migrate_file(store, file_info: dict) -> dict:
+    if not file_info.get("base64_data"):
+        return file_info
+    content = base64.b64decode(file_info["base64_data"])
+    migrated = {k: v for k, v in file_info.items() if k != "base64_data"}
+    migrated["sha256"] = store.put(content)
+    migrated["size"] = len(content)
+    migrated["width"], migrated["height"] = image_dimensions(content)
+    return migrated
+
+
+def migrate(batch_size: int = 50, dry_run: bool = False) -> int:
+    store = get_blob_store()
+    query = {"files.base64_data": {"$exists": True}}
+    migrated_reports = 0
+    last_id = None
+
+    while True:
+        # _id 순으로 배치 단위 처리 (중간에 중단돼도 다시 실행하면 이어서 진행)
+        batch_query = dict(query)
+        if last_id is not None:
+            batch_query["_id"] = {"$gt": last_id}
+        batch = list(
+            damage_report_collection.find(batch_query, {"files": 1})
+            .sort("_id", 1)
+            .limit(batch_size)
+        )
+        if not batch:
+            break
+
+        ops = []
+        for report in batch:
+            files = [migrate_file(store, f) for f in report.get("files", [])]
+            ops.append(UpdateOne({"_id": report["_id"]}, {"$set": {"files": files}}))
+        if not dry_run:
+            damage_report_collection.bulk_write(ops, ordered=False)
+
+        migrated_reports += len(batch)
+        last_id = batch[-1]["_id"]
+        print(f"… {migrated_reports}건 처리 (마지막 _id={last_id})")
+
+    return migrated_reports
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="신고 첨부파일 base64 → blob store 마이그레이션")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--dry-run", action="store_true", help="blob 만 저장하고 DB 는 수정하지 않음")
+    args = parser.parse_args(argv)
+
+    total = migrate(args.batch_size, args.dry_run)
+    print(f"✅ 마이그레이션 완료: {total}건")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+damage_report 전체로 report_tiles 셀 집계를 다시 계산 (aggregation pipeline + $merge)
+- 임시 컬렉션에 집계한 뒤 renameCollection(dropTarget) 으로 교체 → 재계산 중에도 지도 타일이 비지 않음
+- 재계산 도중 들어온 신고의 증분은 교체 시 빠질 수 있으므로 한가한 시간에 실행
+
+    python -m app.tools.rebuild_report_tiles
+"""
+import sys
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from app.database import tool_database
+from app.indexes import INDEX_SPECS
+from app.tiles import TILE_MAX_ZOOM, quadkey_for
+
+db = tool_database()
+damage_report_collection = db["damage_report"]
+report_tiles_collection = db["report_tiles"]
+rebuild_collection = db["report_tiles_rebuild"]
+
+# tiles._count_key 와 같은 규칙 (Mongo 필드 이름에 '.', '$' 는 쓸 수 없음, 비어 있으면 "기타")
+_SUB_CATEGORY = {"$ifNull": ["$sub_category", ""]}
+COUNT_KEY_EXPR = {
+    "$replaceAll": {
+        "input": {"$replaceAll": {
+            "input": {"$cond": [{"$eq": [_SUB_CATEGORY, ""]}, "기타", _SUB_CATEGORY]},
+            "find": ".",
+            "replacement": "_",
+        }},
+        "find": {"$literal": "$"},
+        "replacement": "_",
+    }
+}
+
+
+def backfill_quadkeys(batch_size: int = 500) -> int:
+    """quadkey 가 없는 기존 신고에 채워 넣기"""
+    query = {"quadkey": None, "location": {"$ne": None}}
+    updated = 0
+    while True:
+        batch = list(damage_report_collection.find(query, {"latitude": 1, "longitude": 1}).limit(batch_size))
+        if not batch:
+            return updated
+        damage_report_collection.bulk_write([
+            UpdateOne({"_id": r["_id"]}, {"$set": {"quadkey": quadkey_for(r["latitude"], r["longitude"])}})
+            for r in batch
+        ], ordered=False)
+        updated += len(batch)
+
+
+def rebuild_level(level: int, target):
+    damage_report_collection.aggregate([
+        {"$match": {"quadkey": {"$type": "string"}}},
+        {"$group": {
+            "_id": {
+                "cell": {"$substrBytes": ["$quadkey", 0, level]},
+                "sub": COUNT_KEY_EXPR,
+            },
+            "n": {"$sum": 1},
+            "sum_lat": {"$sum": "$latitude"},
+            "sum_lng": {"$sum": "$longitude"},
+        }},
+        {"$group": {
+            "_id": "$_id.cell",
+            "total": {"$sum": "$n"},
+            "counts": {"$push": {"k": "$_id.sub", "v": "$n"}},
+            "sum_lat": {"$sum": "$sum_lat"},
+            "sum_lng": {"$sum": "$sum_lng"},
+        }},
+        {"$project": {
+            "z": {"$literal": level},
+            "total": 1,
+            "counts": {"$arrayToObject": "$counts"},
+            "sum_lat": 1,
+            "sum_lng": 1,
+            "updated_at": {"$literal": datetime.utcnow()},
+        }},
+        {"$merge": {"into": target.name, "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ], allowDiskUse=True)
+
+
+def main(argv=None) -> int:
+    print(f"… quadkey 백필: {backfill_quadkeys()}건")
+    rebuild_collection.drop()  # 이전 실행이 중간에 멈췄으면 남아 있을 수 있음
+    rebuild_collection.create_indexes(INDEX_SPECS["report_tiles"])
+    for level in range(1, TILE_MAX_ZOOM + 1):
+        rebuild_level(level, rebuild_collection)
+        print(f"… z={level} 집계 완료")
+    rebuild_collection.rename(report_tiles_collection.name, dropTarget=True)
+    print("✅ report_tiles 재계산 완료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
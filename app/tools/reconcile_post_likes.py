@@ -0,0 +1,83 @@
+"""
+post_likes 기준으로 post.likes 카운터를 다시 맞춤 (중복 좋아요 행도 정리)
+
+    python -m app.tools.reconcile_post_likes [--dry-run] [--ensure-indexes]
+"""
+import argparse
+import sys
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import DeleteMany, UpdateOne
+
+from app.database import tool_database
+from app.indexes import ensure_indexes
+
+db = tool_database()
+post_collection = db["post"]
+post_likes_collection = db["post_likes"]
+
+
+def dedupe_likes(dry_run: bool = False) -> int:
+    """같은 (post_id, user_id) 의 중복 행은 가장 먼저 누른 1건만 남김"""
+    duplicates = post_likes_collection.aggregate([
+        {"$sort": {"liked_at": 1, "_id": 1}},
+        {"$group": {"_id": {"post_id": "$post_id", "user_id": "$user_id"},
+                    "ids": {"$push": "$_id"}, "n": {"$sum": 1}}},
+        {"$match": {"n": {"$gt": 1}}},
+    ], allowDiskUse=True)
+    extra_ids = [d["ids"][1:] for d in duplicates]
+    ops = [DeleteMany({"_id": {"$in": ids}}) for ids in extra_ids]
+    removed = sum(len(ids) for ids in extra_ids)
+    if ops and not dry_run:
+        post_likes_collection.bulk_write(ops, ordered=False)
+    return removed
+
+
+def recount_likes(dry_run: bool = False, batch_size: int = 1000) -> int:
+    """post_likes 집계값과 다른 post.likes 만 갱신"""
+    counts = {}
+    for row in post_likes_collection.aggregate([
+        {"$group": {"_id": "$post_id", "n": {"$sum": 1}}},
+    ], allowDiskUse=True):
+        try:
+            counts[ObjectId(row["_id"])] = row["n"]
+        except (InvalidId, TypeError):
+            continue
+
+    fixed = 0
+    ops = []
+    for post in post_collection.find({}, {"likes": 1}):
+        expected = counts.get(post["_id"], 0)
+        if post.get("likes", 0) == expected:
+            continue
+        fixed += 1
+        ops.append(UpdateOne({"_id": post["_id"]}, {"$set": {"likes": expected}}))
+        if len(ops) >= batch_size:
+            if not dry_run:
+                post_collection.bulk_write(ops, ordered=False)
+            ops = []
+    if ops and not dry_run:
+        post_collection.bulk_write(ops, ordered=False)
+    return fixed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="post.likes 카운터 재계산")
+    parser.add_argument("--dry-run", action="store_true", help="변경 없이 건수만 출력")
+    parser.add_argument("--ensure-indexes", action="store_true",
+                        help="정리 후 (post_id, user_id) 유니크 인덱스 생성")
+    args = parser.parse_args(argv)
+
+    removed = dedupe_likes(args.dry_run)
+    print(f"… 중복 좋아요 행 {removed}건 {'발견' if args.dry_run else '삭제'}")
+    fixed = recount_likes(args.dry_run)
+    print(f"… likes 카운터 불일치 {fixed}건 {'발견' if args.dry_run else '수정'}")
+    if args.ensure_indexes and not args.dry_run:
+        ensure_indexes(db)
+    print("✅ 좋아요 정합성 점검 완료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
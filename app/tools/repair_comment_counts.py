@@ -0,0 +1,82 @@
+"""
+comments 기준으로 post.comment_count / recent_comments 를 다시 계산
+
+    python -m app.tools.repair_comment_counts [--dry-run]
+"""
+import argparse
+import sys
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+
+from app.crud import COMMENT_PREVIEW_SIZE, comment_preview
+from app.database import tool_database
+
+db = tool_database()
+comments_collection = db["comments"]
+post_collection = db["post"]
+
+
+def collect_comment_stats() -> dict:
+    """post _id → (댓글 수, 최신 미리보기 리스트)"""
+    stats = {}
+    for row in comments_collection.aggregate([
+        # 게시글별 최신 N건만 유지 ($push 로 전부 모으면 댓글 많은 글에서 16MB 제한에 걸림)
+        {"$group": {
+            "_id": "$post_id",
+            "count": {"$sum": 1},
+            "latest": {"$topN": {
+                "n": COMMENT_PREVIEW_SIZE,
+                "sortBy": {"created_at": -1, "_id": -1},
+                "output": {
+                    "_id": "$_id",
+                    "user_id": "$user_id",
+                    "username": "$username",
+                    "content": "$content",
+                    "created_at": "$created_at",
+                },
+            }},
+        }},
+    ], allowDiskUse=True):
+        try:
+            post_oid = ObjectId(row["_id"])
+        except (InvalidId, TypeError):
+            continue
+        previews = [comment_preview(c) for c in row["latest"]]
+        stats[post_oid] = (row["count"], previews)
+    return stats
+
+
+def repair(dry_run: bool = False, batch_size: int = 1000) -> int:
+    stats = collect_comment_stats()
+    fixed = 0
+    ops = []
+    for post in post_collection.find({}, {"comment_count": 1, "recent_comments": 1}):
+        count, previews = stats.get(post["_id"], (0, []))
+        if post.get("comment_count") == count and post.get("recent_comments") == previews:
+            continue
+        fixed += 1
+        ops.append(UpdateOne({"_id": post["_id"]},
+                             {"$set": {"comment_count": count, "recent_comments": previews}}))
+        if len(ops) >= batch_size:
+            if not dry_run:
+                post_collection.bulk_write(ops, ordered=False)
+            ops = []
+    if ops and not dry_run:
+        post_collection.bulk_write(ops, ordered=False)
+    return fixed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="post 댓글 수 / 미리보기 재계산")
+    parser.add_argument("--dry-run", action="store_true", help="변경 없이 건수만 출력")
+    args = parser.parse_args(argv)
+
+    fixed = repair(args.dry_run)
+    print(f"✅ 댓글 집계 불일치 {fixed}건 {'발견' if args.dry_run else '수정'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())